@@ -0,0 +1,324 @@
+"""Seeded generators of synthetic puzzle inputs.
+
+Each generator takes a `scale` (1 is roughly the size of the real puzzle input) and a seeded `random.Random`, and
+returns the text of an input file that the matching `solutions.dayN` parts accept.  Grid based days grow both sides
+by `sqrt(scale)` so that the number of cells, rather than the side length, scales with `scale`.
+"""
+import math
+import random
+import string
+from typing import Callable, Dict, List
+
+Generator = Callable[[float, random.Random], str]
+
+ITEM_TYPES = string.ascii_lowercase + string.ascii_uppercase
+
+
+def scaled(base: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, round(base * scale))
+
+
+def scaled_side(base: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, round(base * math.sqrt(scale)))
+
+
+def generate_day1(scale: float, rng: random.Random) -> str:
+    elves = [
+        "\n".join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))) for _ in range(scaled(250, scale))
+    ]
+    return "\n\n".join(elves) + "\n\n"
+
+
+def generate_day2(scale: float, rng: random.Random) -> str:
+    return "\n".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(scaled(2500, scale)))
+
+
+def rucksack(items: List[str], badge: str, rng: random.Random) -> str:
+    """A rucksack whose halves share exactly one item type and which contains the group's `badge`."""
+    pool = items + [badge]
+    shared = rng.choice(pool)
+    rest = [item for item in pool if item != shared]
+    rng.shuffle(rest)
+    left, right = rest[: len(rest) // 2], rest[len(rest) // 2 :]
+    size = rng.randint(8, 24)
+    left_half = [shared] + [rng.choice(left) for _ in range(size - 1)]
+    right_half = [shared] + [rng.choice(right) for _ in range(size - 1)]
+    if badge != shared:
+        (left_half if badge in left else right_half)[-1] = badge
+    rng.shuffle(left_half)
+    rng.shuffle(right_half)
+    return "".join(left_half + right_half)
+
+
+def generate_day3(scale: float, rng: random.Random) -> str:
+    lines: List[str] = []
+    for _ in range(scaled(100, scale)):
+        item_types = list(ITEM_TYPES)
+        rng.shuffle(item_types)
+        badge, others = item_types[0], item_types[1:]
+        lines.extend(rucksack(others[k::3], badge, rng) for k in range(3))
+    return "\n".join(lines)
+
+
+def generate_day4(scale: float, rng: random.Random) -> str:
+    pairs = []
+    for _ in range(scaled(1000, scale)):
+        (a, b), (c, d) = sorted(rng.sample(range(1, 100), 2)), sorted(rng.sample(range(1, 100), 2))
+        pairs.append(f"{a}-{b},{c}-{d}")
+    return "\n".join(pairs)
+
+
+def generate_day5(scale: float, rng: random.Random, num_stacks: int = 9) -> str:
+    heights = [rng.randint(1, scaled(8, scale)) for _ in range(num_stacks)]
+    rows = []
+    for level in range(max(heights), 0, -1):
+        slots = [f"[{rng.choice(string.ascii_uppercase)}]" if height >= level else "   " for height in heights]
+        rows.append(" ".join(slots))
+    rows.append(" ".join(f" {k + 1} " for k in range(num_stacks)))
+    rows.append("")
+    for _ in range(scaled(500, scale)):
+        sources = [k for k, height in enumerate(heights) if height > 1]
+        if not sources:
+            break
+        from_ix = rng.choice(sources)
+        to_ix = rng.choice([k for k in range(num_stacks) if k != from_ix])
+        amount = rng.randint(1, min(heights[from_ix] - 1, 30))
+        heights[from_ix] -= amount
+        heights[to_ix] += amount
+        rows.append(f"move {amount} from {from_ix + 1} to {to_ix + 1}")
+    return "\n".join(rows)
+
+
+def generate_day6(scale: float, rng: random.Random) -> str:
+    """Only three letters are used before the closing run of 14 distinct ones, so both markers sit at the end."""
+    prefix = "".join(rng.choice("abc") for _ in range(scaled(4096, scale, minimum=32) - 14))
+    return prefix + "".join(rng.sample("defghijklmnopqrstuvwxyz", 14))
+
+
+def generate_day7(scale: float, rng: random.Random) -> str:
+    lines = ["$ cd /"]
+    pending: List[List[str]] = []  # Subdirectories still to visit, per level of the current path
+    while True:
+        if len(lines) > 1:
+            while len(pending) > 1 and not pending[-1]:
+                pending.pop()
+                lines.append("$ cd ..")
+            if not pending[-1]:
+                break
+            lines.append(f"$ cd {pending[-1].pop()}")
+        lines.append("$ ls")
+        if not pending:  # The root gets many subtrees, as the depth cap keeps each one small
+            num_names = scaled(25, scale)
+            names, num_dirs = [f"{name:x}" for name in rng.sample(range(16**6), num_names)], num_names
+        else:
+            names = [f"{name:x}" for name in rng.sample(range(16**6), rng.randint(1, 8))]
+            full = len(lines) >= scaled(1000, scale) or len(pending) >= 12
+            num_dirs = 0 if full else rng.randint(0, min(4, len(names)))
+        lines.extend(f"dir {name}" for name in names[:num_dirs])
+        lines.extend(
+            f"{rng.randint(1000, 300000)} {name}.{rng.choice(['txt', 'dat', 'log'])}" for name in names[num_dirs:]
+        )
+        pending.append(names[:num_dirs])
+    return "\n".join(lines)
+
+
+def generate_day8(scale: float, rng: random.Random) -> str:
+    side = scaled_side(99, scale, minimum=3)
+    return "\n".join("".join(rng.choices(string.digits, k=side)) for _ in range(side))
+
+
+def generate_day9(scale: float, rng: random.Random) -> str:
+    return "\n".join(f"{rng.choice('RLUD')} {rng.randint(1, 19)}" for _ in range(scaled(2000, scale)))
+
+
+def generate_day10(scale: float, rng: random.Random) -> str:
+    program: List[str] = []
+    cycles, x_reg = 0, 1
+    while cycles < 240 or len(program) < scaled(145, scale):
+        if rng.random() < 0.35:
+            program.append("noop")
+            cycles += 1
+        else:
+            units = rng.choice([v for v in range(-10, 11) if v != 0 and -5 <= x_reg + v <= 45])
+            program.append(f"addx {units}")
+            cycles += 2
+            x_reg += units
+    return "\n".join(program)
+
+
+def generate_day11(scale: float, rng: random.Random, num_monkeys: int = 8) -> str:
+    moduli = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37][:num_monkeys]
+    rng.shuffle(moduli)
+    operations = ["old * old", f"old * {rng.randint(2, 19)}"] + [
+        f"old + {rng.randint(1, 8)}" for _ in range(num_monkeys - 2)
+    ]
+    rng.shuffle(operations)
+    items_per_monkey = scaled(4, scale)
+    monkeys = []
+    for k in range(num_monkeys):
+        true_monkey, false_monkey = rng.sample([j for j in range(num_monkeys) if j != k], 2)
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 2 * items_per_monkey)))
+        monkeys.append(
+            f"Monkey {k}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = {operations[k]}\n"
+            f"  Test: divisible by {moduli[k]}\n"
+            f"    If true: throw to monkey {true_monkey}\n"
+            f"    If false: throw to monkey {false_monkey}"
+        )
+    return "\n\n".join(monkeys)
+
+
+def generate_day12(scale: float, rng: random.Random) -> str:
+    """A cone around E whose height drops by at most one per step outwards, so E is reachable from everywhere."""
+    nrows, ncols = scaled_side(41, scale, minimum=8), scaled_side(67, scale, minimum=8)
+    end = (rng.randrange(nrows // 4, 3 * nrows // 4), rng.randrange(ncols // 4, 3 * ncols // 4))
+    start = (rng.choice([0, nrows - 1]), rng.choice([0, ncols - 1]))
+    step = max(1, (nrows + ncols) // 4 // 26)  # Keeps the corners, and so S, at height "a"
+    rows = []
+    for row_ix in range(nrows):
+        row = []
+        for col_ix in range(ncols):
+            dist = abs(row_ix - end[0]) + abs(col_ix - end[1]) + rng.randrange(step)
+            row.append(string.ascii_lowercase[max(0, 25 - dist // step)])
+        rows.append(row)
+    rows[start[0]][start[1]], rows[end[0]][end[1]] = "S", "E"
+    return "\n".join("".join(row) for row in rows)
+
+
+def random_packet(rng: random.Random, depth: int = 0) -> str:
+    entries = []
+    for _ in range(rng.randint(0, 5)):
+        if depth < 4 and rng.random() < 0.3:
+            entries.append(random_packet(rng, depth + 1))
+        else:
+            entries.append(str(rng.randint(0, 10)))
+    return f"[{','.join(entries)}]"
+
+
+def generate_day13(scale: float, rng: random.Random) -> str:
+    pairs = []
+    for _ in range(scaled(150, scale)):
+        left, right = random_packet(rng), random_packet(rng)
+        while {left, right} & {"[[2]]", "[[6]]"}:
+            left, right = random_packet(rng), random_packet(rng)
+        pairs.append(f"{left}\n{right}")
+    return "\n\n".join(pairs)
+
+
+def turn(value: int, length: int, low: int, high: int, rng: random.Random) -> int:
+    """`value` moved `length` in a random direction, the other one if that leaves [low, high], clamped if both do.
+
+    Clamping every overshoot would instead pile segments onto the boundary rows and columns.
+    """
+    step = rng.choice([-1, 1]) * length
+    if not low <= value + step <= high:
+        step = -step
+    return min(max(value + step, low), high)
+
+
+def rock_scans(scale: float, depth: int, rng: random.Random) -> List[str]:
+    """Rock paths no deeper than `depth`, below a rock free band under the source as in real inputs."""
+    top = max(2, depth // 12)
+    scans = []
+    for _ in range(scaled(175, scale)):
+        x, y = rng.randint(500 - depth // 2, 500 + depth // 2), rng.randint(top, depth)
+        points = [(x, y)]
+        for k in range(rng.randint(1, 6)):
+            length = rng.randint(1, 10)
+            if k % 2 == 0:
+                x = turn(x, length, 500 - depth // 2, 500 + depth // 2, rng)
+            else:
+                y = turn(y, length, top, depth, rng)
+            points.append((x, y))
+        scans.append(" -> ".join(f"{px},{py}" for px, py in points))
+    return scans
+
+
+def sand_escapes(scans: List[str], depth: int) -> bool:
+    """Whether sand poured at (500, 0) onto rock no deeper than `depth` falls past it before piling up to the source.
+
+    Kept apart from `solutions.day14` so that a bug there cannot change or stall the benchmark inputs.  Sand can
+    drift at most one column per row, so a grid reaching `depth` + 1 either side of the source holds all of it.
+    """
+    x0, width = 500 - depth - 1, 2 * depth + 3
+    cells = bytearray(width * (depth + 2))
+    for scan in scans:
+        points = [tuple(map(int, point.split(","))) for point in scan.split(" -> ")]
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            first, length = min(y1, y2) * width + min(x1, x2) - x0, 1 + abs(x2 - x1) + abs(y2 - y1)
+            step = width if x1 == x2 else 1
+            cells[first : first + step * length : step] = b"\x01" * length
+    bottom, path = (depth + 1) * width, [500 - x0]  # Falling path of the current grain
+    while path:
+        cell = path[-1]
+        if cell >= bottom:
+            return True
+        for below in (cell + width, cell + width - 1, cell + width + 1):
+            if not cells[below]:
+                path.append(below)
+                break
+        else:
+            cells[cell] = 1
+            path.pop()
+    return False
+
+
+def generate_day14(scale: float, rng: random.Random, max_draws: int = 100) -> str:
+    """`rock_scans`, drawn again while the rock forms a bowl under the source.
+
+    Sand without a floor would fill such a bowl up to the source, which Part 1 never expects (the original `Cave`
+    fill does not even stop), so scans are only accepted once sand escapes into the abyss.
+    """
+    depth = scaled_side(170, scale, minimum=10)
+    for _ in range(max_draws):
+        scans = rock_scans(scale, depth, rng)
+        if sand_escapes(scans, depth):
+            return "\n".join(scans)
+    raise RuntimeError(f"no day 14 rock without a bowl under the source in {max_draws} draws at scale {scale:g}")
+
+
+def generate_day15(scale: float, rng: random.Random, max_xy: int = 4000000) -> str:
+    """Sensors on a lattice over [0, max_xy]^2 whose ranges cover all of it except for one hidden point.
+
+    Every sensor's range is capped just short of the hidden point, and lattice spacing keeps all other points in
+    range of the lattice corner that lies beyond them as seen from the hidden point.
+    """
+    cells = max(4, round(math.sqrt(24 * scale)) - 1)
+    lattice = [round(k * max_xy / cells) for k in range(cells + 1)]
+    spacing = max(b - a for a, b in zip(lattice, lattice[1:]))
+    hidden = lattice[0], lattice[0]
+    while hidden[0] in lattice or hidden[1] in lattice:
+        hidden = (rng.randint(max_xy // 4, 3 * max_xy // 4), rng.randint(max_xy // 4, 3 * max_xy // 4))
+    lines = []
+    for sx in lattice:
+        for sy in lattice:
+            radius = min(2 * spacing, abs(sx - hidden[0]) + abs(sy - hidden[1]) - 1)
+            bx, by = rng.choice([(sx + radius, sy), (sx - radius, sy), (sx, sy + radius), (sx, sy - radius)])
+            lines.append(f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+GENERATORS: Dict[int, Generator] = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+    9: generate_day9,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    13: generate_day13,
+    14: generate_day14,
+    15: generate_day15,
+}
+
+
+def generate_input(day: int, scale: float, seed: int = 2022) -> str:
+    """Input text for `day` at `scale`; the same (day, scale, seed) always yields the same text."""
+    return GENERATORS[day](scale, random.Random(f"{seed}/{day}/{scale:g}"))
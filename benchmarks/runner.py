@@ -0,0 +1,162 @@
+"""Scaling benchmarks for the daily solutions.
+
+Every selected part is run against seeded synthetic inputs (see `benchmarks.generators`) at increasing scales,
+recording wall time and `tracemalloc` peak memory per part and per scale.  Results can be saved as a baseline and
+later runs compared against it, flagging slowdowns, memory growth and changed answers.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from benchmarks.generators import generate_input
+from solutions.runner import DAYS, PARTS, get_solver
+
+DEFAULT_SCALES = (1.0, 10.0, 100.0, 1000.0)
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+NOISE_FLOOR_SECONDS = 0.01  # Timings below this are too noisy to call a regression
+
+
+class Measurement(NamedTuple):
+    day: int
+    part: int
+    scale: float
+    input_bytes: int
+    seconds: float
+    peak_bytes: Optional[int]
+    answer: str
+
+
+def measure(day: int, part: int, scale: float, path: Path, repeat: int = 1, memory: bool = True) -> Measurement:
+    solver = get_solver(day, part)
+    assert solver is not None
+    seconds, answer = math.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = solver(path)
+        seconds = min(seconds, time.perf_counter() - start)
+    peak_bytes = None
+    if memory:  # Separate run, tracemalloc slows allocation heavy code down considerably
+        tracemalloc.start()
+        try:
+            solver(path)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return Measurement(day, part, scale, path.stat().st_size, seconds, peak_bytes, str(answer))
+
+
+def run_benchmarks(
+    days: Sequence[int],
+    parts: Sequence[int],
+    scales: Sequence[float],
+    seed: int = 2022,
+    repeat: int = 1,
+    max_seconds: Optional[float] = None,
+    memory: bool = True,
+) -> List[Measurement]:
+    """Measure every (day, part) at each scale, smallest first.
+
+    A part that takes longer than `max_seconds` at some scale is not run at any larger one.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for day in days:
+            live_parts = [part for part in parts if get_solver(day, part) is not None]
+            for scale in sorted(scales):
+                if not live_parts:
+                    break
+                path = Path(tmp_dir) / f"day{day}.txt"
+                path.write_text(generate_input(day, scale, seed))
+                for part in list(live_parts):
+                    result = measure(day, part, scale, path, repeat=repeat, memory=memory)
+                    print(format_measurement(result), flush=True)
+                    results.append(result)
+                    if max_seconds is not None and result.seconds > max_seconds:
+                        live_parts.remove(part)
+    return results
+
+
+def format_measurement(result: Measurement) -> str:
+    peak = "-" if result.peak_bytes is None else f"{result.peak_bytes / 2**20:.1f} MiB"
+    answer = result.answer if "\n" not in result.answer else "<multi-line>"
+    return (
+        f"Day {result.day:>2} Part {result.part} x{result.scale:<8g} {result.input_bytes:>12,} B"
+        f" {result.seconds:>10.4f}s {peak:>12}  {answer}"
+    )
+
+
+def save_baseline(results: List[Measurement], path: Path, seed: int) -> None:
+    meta = {"seed": seed, "python": platform.python_version(), "machine": platform.machine()}
+    path.write_text(json.dumps({"meta": meta, "results": [res._asdict() for res in results]}, indent=2))
+
+
+def compare_to_baseline(results: List[Measurement], path: Path, seed: int, tolerance: float) -> List[str]:
+    """Describe every measurement that is slower, hungrier, or answers differently than the stored baseline."""
+    baseline = json.loads(path.read_text())
+    if baseline["meta"]["seed"] != seed:
+        return [f"baseline {path} was recorded with seed {baseline['meta']['seed']}, not {seed}"]
+    stored: Dict[Tuple[int, int, float], Dict[str, Any]] = {
+        (res["day"], res["part"], res["scale"]): res for res in baseline["results"]
+    }
+    flags = []
+    for res in results:
+        base = stored.get((res.day, res.part, res.scale))
+        if base is None:
+            continue
+        label = f"Day {res.day:>2} Part {res.part} x{res.scale:g}:"
+        if res.answer != base["answer"]:
+            flags.append(f"{label} answer changed from {base['answer']!r} to {res.answer!r}")
+        if res.seconds > max(NOISE_FLOOR_SECONDS, base["seconds"] * (1 + tolerance)):
+            flags.append(f"{label} {base['seconds']:.4f}s -> {res.seconds:.4f}s")
+        if res.peak_bytes is not None and base["peak_bytes"] is not None:
+            if res.peak_bytes > base["peak_bytes"] * (1 + tolerance):
+                flags.append(f"{label} peak {base['peak_bytes']:,} B -> {res.peak_bytes:,} B")
+    return flags
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark solutions on synthetic inputs."
+    )
+    parser.add_argument("days", nargs="*", type=int, metavar="DAY", help="days to benchmark (default: all)")
+    parser.add_argument("-p", "--parts", nargs="+", type=int, choices=PARTS, default=PARTS, help="parts to run")
+    parser.add_argument("-s", "--scales", nargs="+", type=float, default=DEFAULT_SCALES, help="input size multipliers")
+    parser.add_argument("--seed", type=int, default=2022, help="seed for the input generators")
+    parser.add_argument("--repeat", type=int, default=1, help="report the best of this many timed runs")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="skip larger scales once a part is slower")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory run")
+    parser.add_argument("--save", nargs="?", type=Path, const=DEFAULT_BASELINE, help="store results as the baseline")
+    parser.add_argument("--compare", nargs="?", type=Path, const=DEFAULT_BASELINE, help="flag regressions vs baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown / memory growth")
+    args = parser.parse_args(argv)
+    if any(day not in DAYS for day in args.days):
+        parser.error(f"days must be between {DAYS[0]} and {DAYS[-1]}")
+
+    results = run_benchmarks(
+        args.days or DAYS,
+        args.parts,
+        args.scales,
+        seed=args.seed,
+        repeat=args.repeat,
+        max_seconds=args.max_seconds,
+        memory=not args.no_memory,
+    )
+    if args.compare is not None:
+        flags = compare_to_baseline(results, args.compare, args.seed, args.tolerance)
+        for flag in flags:
+            print(f"REGRESSION {flag}")
+        if flags:
+            sys.exit(1)
+    if args.save is not None:
+        save_baseline(results, args.save, args.seed)
+
+
+if __name__ == "__main__":
+    main()
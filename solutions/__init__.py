@@ -0,0 +1,8 @@
+from pathlib import Path
+
+INPUTS_DIR = Path(__file__).resolve().parent.parent / "inputs"
+
+
+def input_path(day: int, test: bool = False) -> Path:
+    """Location of a day's puzzle input, or of its worked example when `test` is set."""
+    return INPUTS_DIR / f"day{day}{'_test' * test}.txt"
@@ -0,0 +1,3 @@
+from solutions.runner import main
+
+main()
@@ -0,0 +1,96 @@
+"""Content addressed on-disk cache of solved parts.
+
+An answer is stored under a hash of everything it depends on: the day and part, any extra solver parameters, the
+bytes of the input file and the source of the day's module together with the shared (non day) modules of this
+package.  Editing a solution or its input therefore simply misses the cache, with no invalidation to manage.  Each
+entry is a small JSON file whose modification time doubles as its last use, and the least recently used entries are
+deleted once the directory outgrows `max_bytes`.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = PACKAGE_DIR.parent / ".cache" / "results"
+DEFAULT_MAX_BYTES = 16 * 2**20
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(day: int) -> str:
+    """Hash of the day's module and of every module it may share code with."""
+    shared = sorted(path for path in PACKAGE_DIR.glob("*.py") if not path.stem.startswith("day"))
+    digest = hashlib.sha256()
+    for path in [PACKAGE_DIR / f"day{day}.py"] + shared:
+        digest.update(path.name.encode() + b"\0" + path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, day: int, part: int, path: Path, params: Optional[Dict[str, Any]] = None) -> str:
+        fields = {
+            "day": day,
+            "part": part,
+            "params": params or {},
+            "input": file_digest(path),
+            "source": source_digest(day),
+        }
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+    def entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Whether `key` is cached, and its answer if so; a hit marks the entry as just used."""
+        entry = self.entry(key)
+        try:
+            answer = json.loads(entry.read_text())["answer"]
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            return False, None
+        return True, answer
+
+    def put(self, key: str, answer: Any) -> bool:
+        """Store `answer` unless it is not JSON serialisable, then evict down to `max_bytes`."""
+        try:
+            payload = json.dumps({"answer": answer})
+        except TypeError:
+            return False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as handle:
+            handle.write(payload)
+        os.replace(handle.name, self.entry(key))  # Readers never see a half written entry
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.directory.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:  # Removed by a concurrent run
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*.json"):
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,43 @@
+"""Splitting input files into byte ranges that worker processes read on their own.
+
+Workers are handed a path and a (start, end) range rather than the data, so only the results cross process boundaries.
+Cuts always land just after a newline, or just after a blank line for inputs made of blank line separated records.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def byte_ranges(path: Path, num_chunks: int, blank_line: bool = False) -> List[Tuple[int, int]]:
+    """Byte ranges splitting the file into about `num_chunks` pieces, each cut just after a newline.
+
+    With `blank_line` every cut is moved on to just after the next blank line instead.
+    """
+    size = os.path.getsize(path)
+    cuts = [0]
+    with open(path, "rb") as handle:
+        for k in range(1, num_chunks):
+            handle.seek(max(cuts[-1], k * size // num_chunks))
+            handle.readline()  # Finish the line the cut landed in
+            if blank_line:
+                for line in iter(handle.readline, b""):
+                    if not line.strip():
+                        break
+            cuts.append(handle.tell())
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def map_byte_ranges(
+    function: Callable[..., T], path: Path, workers: Optional[int], *args: Any, blank_line: bool = False
+) -> List[T]:
+    """`function(path, start, end, *args)` for every range of `byte_ranges`, one per worker, in a process pool.
+
+    `workers=None` uses one worker per core.
+    """
+    bounds = byte_ranges(path, workers or os.cpu_count() or 1, blank_line)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, *zip(*[(path, start, end, *args) for start, end in bounds])))
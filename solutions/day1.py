@@ -1,9 +1,15 @@
-from typing import List
+import heapq
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
+from solutions import input_path
+from solutions.chunks import map_byte_ranges
 
-def load_elf_data() -> List[List[int]]:
+
+def load_elf_data(path: Path = input_path(1)) -> List[List[int]]:
     res = []
-    with open("inputs/day1.txt", "r") as handle:
+    with open(path, "r") as handle:
         cur_elf: List[int] = []
         for line in handle.readlines():
             if line.strip() == "":
@@ -14,11 +20,77 @@ def load_elf_data() -> List[List[int]]:
     return res
 
 
-def get_max_cal_elves(top_k: int) -> int:
+def get_max_cal_elves(top_k: int, path: Path = input_path(1)) -> int:
     """Part Solve Part 1 / 2, sum calories of the top K-th elves carrying the most Calories."""
-    sorted_elf_data = sorted(load_elf_data(), key=lambda elf: -sum(elf))
+    sorted_elf_data = sorted(load_elf_data(path), key=lambda elf: -sum(elf))
     return sum([sum(elf) for elf in sorted_elf_data[:top_k]])
 
 
-print("Part 1: ", get_max_cal_elves(1))
-print("Part 2: ", get_max_cal_elves(3))
+def elf_totals(lines: Iterable[bytes]) -> Iterator[int]:
+    """Calories carried by each elf, summed as its lines are read."""
+    total, has_items = 0, False
+    for line in lines:
+        if line.strip():
+            total, has_items = total + int(line), True
+        elif has_items:
+            yield total
+            total, has_items = 0, False
+    if has_items:  # The last elf need not be followed by a blank line
+        yield total
+
+
+def top_totals(totals: Iterable[int], top_k: int) -> List[int]:
+    """The `top_k` largest totals, largest first, keeping only a heap of that size."""
+    heap: List[int] = []
+    for total in totals:
+        if len(heap) < top_k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def chunk_lines(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        position = start
+        while position < end:
+            line = handle.readline()
+            if not line:
+                return
+            position += len(line)
+            yield line
+
+
+def chunk_top_totals(path: Path, start: int, end: int, top_k: int) -> List[int]:
+    return top_totals(elf_totals(chunk_lines(path, start, end)), top_k)
+
+
+def max_calories(top_ks: Sequence[int], path: Path = input_path(1), workers: Optional[int] = 1) -> Dict[int, int]:
+    """Calories carried by the top k elves for every k in `top_ks`, from a single pass over the file.
+
+    With several workers the file is split at blank lines, every chunk keeps its own top totals and the partial
+    heaps are merged; `workers=None` uses one per core.
+    """
+    top_k = max(top_ks)
+    if workers == 1:
+        with open(path, "rb") as handle:
+            largest = top_totals(elf_totals(handle), top_k)
+    else:
+        partial = map_byte_ranges(chunk_top_totals, path, workers, top_k, blank_line=True)
+        largest = heapq.nlargest(top_k, chain.from_iterable(partial))
+    return {k: sum(largest[:k]) for k in top_ks}
+
+
+PARTS = {1: lambda path: max_calories([1], path)[1], 2: lambda path: max_calories([3], path)[3]}
+
+
+if __name__ == "__main__":
+    # Tests
+    test_lines = [b"1000", b"2000", b"3000", b"", b"4000", b"", b"5000", b"6000", b"", b"7000", b"8000", b"9000"]
+    test_lines += [b"", b"10000"]
+    assert top_totals(elf_totals(test_lines), 3) == [24000, 11000, 10000]
+    assert max_calories([1, 3]) == max_calories([1, 3], workers=4) == {1: 68292, 3: 203203}
+
+    print("Part 1: ", max_calories([1])[1])
+    print("Part 2: ", max_calories([3])[3])
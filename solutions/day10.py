@@ -1,4 +1,7 @@
-from typing import List, TypeAlias
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, TypeAlias
+
+from solutions import input_path
 
 Program: TypeAlias = List[str]
 
@@ -19,24 +22,92 @@ def signal_strength(program: Program, start_cycle: int, cycle_step: int, cycles:
     return sum([c_ix * signal[2 * c_ix] for c_ix in range(start_cycle, start_cycle + cycle_step * cycles, cycle_step)])
 
 
-def draw_pixels(program, pixel_width: int = 40, pixel_height: int = 6) -> None:
+def render_pixels(program: Program, pixel_width: int = 40, pixel_height: int = 6) -> str:
     signal = get_signal(program)
     pixel_sequence = ""
     for k in range(pixel_width * pixel_height):
         next_char = "#" if (abs(signal[2 * k + 2] - (k % pixel_width)) <= 1) else "."
         pixel_sequence += next_char
-    for k in range(0, pixel_width * pixel_height, pixel_width):
-        print(pixel_sequence[k : k + pixel_width])
+    return "\n".join(pixel_sequence[k : k + pixel_width] for k in range(0, pixel_width * pixel_height, pixel_width))
+
+
+def draw_pixels(program: Program, pixel_width: int = 40, pixel_height: int = 6) -> None:
+    print(render_pixels(program, pixel_width, pixel_height))
+
+
+class Timeline(NamedTuple):
+    """The X register as runs: X is `values[k]` from cycle `starts[k]` until the next run starts."""
+
+    starts: List[int]
+    values: List[int]
+    num_cycles: int
+
+
+def compile_timeline(program: Iterable[str]) -> Timeline:
+    starts, values, cycle = [1], [1], 0
+    for instruction in program:
+        match instruction.split():
+            case ["noop"]:
+                cycle += 1
+            case ["addx", units]:
+                cycle += 2
+                if int(units):
+                    starts.append(cycle + 1)
+                    values.append(values[-1] + int(units))
+    return Timeline(starts, values, cycle)
+
+
+def register_during(timeline: Timeline, cycle: int) -> int:
+    return timeline.values[bisect_right(timeline.starts, cycle) - 1]
+
+
+def timeline_cycles(timeline: Timeline) -> Iterator[Tuple[int, int]]:
+    """Every (cycle, X during it) pair of the program, produced run by run."""
+    bounds = timeline.starts[1:] + [timeline.num_cycles + 1]
+    for start, end, value in zip(timeline.starts, bounds, timeline.values):
+        for cycle in range(start, min(end, timeline.num_cycles + 1)):
+            yield cycle, value
+
+
+def timeline_signal_strength(timeline: Timeline, start_cycle: int, cycle_step: int, cycles: int) -> int:
+    sampled = range(start_cycle, start_cycle + cycle_step * cycles, cycle_step)
+    return sum(cycle * register_during(timeline, cycle) for cycle in sampled)
+
+
+def render_timeline(timeline: Timeline, pixel_width: int = 40, pixel_height: int = 6) -> str:
+    """Draw the CRT into a preallocated buffer, lighting pixels run by run rather than cycle by cycle."""
+    row_width = pixel_width + 1  # Including the newline
+    screen = bytearray(b"." * pixel_width + b"\n") * pixel_height
+    bounds = timeline.starts[1:] + [pixel_width * pixel_height + 1]
+    for start, end, value in zip(timeline.starts, bounds, timeline.values):
+        for k in range(start - 1, min(end - 1, pixel_width * pixel_height)):
+            if abs(value - k % pixel_width) <= 1:
+                screen[k // pixel_width * row_width + k % pixel_width] = ord("#")
+    return screen[:-1].decode()
+
 
+PARTS = {
+    1: lambda path: timeline_signal_strength(compile_timeline(open(path)), 20, 40, 6),
+    2: lambda path: render_timeline(compile_timeline(open(path))),
+}
 
-# Tests
-test_program: Program = open("inputs/day10_test.txt").read().split("\n")
-assert get_signal(test_program)[40 : 40 + 80 * 6 : 80] == [21, 19, 18, 21, 16, 18]
-assert signal_strength(test_program, 20, 40, 6) == 13140
-draw_pixels(test_program)
 
+if __name__ == "__main__":
+    # Tests
+    test_program: Program = open(input_path(10, test=True)).read().split("\n")
+    assert get_signal(test_program)[40 : 40 + 80 * 6 : 80] == [21, 19, 18, 21, 16, 18]
+    assert signal_strength(test_program, 20, 40, 6) == 13140
+    draw_pixels(test_program)
+    test_timeline = compile_timeline(test_program)
+    assert [register_during(test_timeline, c) for c in range(20, 240, 40)] == [21, 19, 18, 21, 16, 18]
+    assert [x for _, x in timeline_cycles(test_timeline)] == get_signal(test_program)[2 : 2 * 240 + 2 : 2]
+    assert timeline_signal_strength(test_timeline, 20, 40, 6) == 13140
+    assert render_timeline(test_timeline) == render_pixels(test_program)
+    assert render_timeline(test_timeline, 20, 3) == render_pixels(test_program, 20, 3)
 
-program: Program = open("inputs/day10.txt").read().split("\n")
-print("Part 1: ", signal_strength(program, 20, 40, 6))
-print("Part 2: ")
-draw_pixels(program)
+    program: Program = open(input_path(10)).read().split("\n")
+    timeline = compile_timeline(program)
+    assert render_timeline(timeline) == render_pixels(program)
+    print("Part 1: ", timeline_signal_strength(timeline, 20, 40, 6))
+    print("Part 2: ")
+    print(render_timeline(timeline))
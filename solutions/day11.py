@@ -1,5 +1,10 @@
+import math
 from functools import reduce
-from typing import Dict, List, Optional, Tuple, TypeAlias, Union, cast
+from typing import Dict, List, Literal, NamedTuple, Optional, Tuple, TypeAlias, Union, cast
+
+import numpy as np
+
+from solutions import input_path, instrument
 
 MonkeyTracker: TypeAlias = Dict[int, "Monkey"]
 MonkeyList: TypeAlias = List[str]
@@ -50,6 +55,8 @@ class Monkey:
         match self.worry_modifier_params:
             case (bin_op, "old"):
                 return op_dict[bin_op](item, item)
+            case (bin_op, str(modifier)):
+                return op_dict[bin_op](item, int(modifier))
             case (bin_op, modifier):
                 return op_dict[bin_op](item, modifier)
         return item
@@ -67,7 +74,6 @@ class Monkey:
 
     def inspect_and_throw(self) -> Tuple[int, MonkeyItem]:
         item = self.worry_modifier(self.held_items.pop(0))
-        print(item)
         item = cast(int, item) // 3 if self.ring_product is None else item
         self.inspection_count += 1
         target_monkey = self.throw(item)
@@ -82,7 +88,6 @@ def initialize_monkey_state(monkey_input: MonkeyList, use_ring_product: bool = F
         modulus = int(monkey_info[3][-1])
         monkey_moduli.add(modulus)
         start_items = [cast(MonkeyItem, int(item.replace(",", ""))) for item in monkey_info[1][2:]]
-        print(start_items)
         modifier_params = monkey_info[2][-2:]
         monkey_tracker[k] = Monkey(
             start_items=start_items,
@@ -97,8 +102,8 @@ def initialize_monkey_state(monkey_input: MonkeyList, use_ring_product: bool = F
             monkey.ring_product = ring_product
             monkey.held_items = [ring_product.map_z_to_ring(item) for item in monkey.held_items]
             match monkey.worry_modifier_params:
-                case (op, mod) if type(mod) == int:
-                    monkey.worry_modifier_params = (op, ring_product.map_z_to_ring(mod))
+                case (op, mod) if mod.isdigit():
+                    monkey.worry_modifier_params = (op, ring_product.map_z_to_ring(int(mod)))
     return monkey_tracker
 
 
@@ -110,22 +115,179 @@ def simulate_monkey_rounds(monkey_tracker: MonkeyTracker, num_rounds: int) -> Mo
             while monkey.held_items:
                 target_monkey, item = monkey.inspect_and_throw()
                 end_state[target_monkey].catch_item(item)
+    report_inspections(monkey_tracker)
     return monkey_tracker
 
 
-def get_monkey_business(monkey_input: MonkeyList, num_rounds: int, use_ring_product: bool = False) -> int:
-    monkey_state = initialize_monkey_state(monkey_input, use_ring_product)
-    monkey_state = simulate_monkey_rounds(monkey_state, num_rounds)
+def report_inspections(monkey_tracker: MonkeyTracker) -> None:
+    for k, monkey in monkey_tracker.items():
+        instrument.count(f"day11.monkey{k}.inspections", monkey.inspection_count)
+
+
+class CompiledMonkeys(NamedTuple):
+    """Every monkey's operation, `new = old * mult + add` (or `old * old` where `square`), and test as arrays."""
+
+    mult: np.ndarray
+    add: np.ndarray
+    square: np.ndarray
+    modulus: np.ndarray
+    true_monkey: np.ndarray
+    false_monkey: np.ndarray
+
+
+def compile_monkeys(monkey_tracker: MonkeyTracker) -> CompiledMonkeys:
+    operations: List[Tuple[int, int, bool]] = []
+    for k in range(len(monkey_tracker)):
+        match monkey_tracker[k].worry_modifier_params:
+            case ("*", "old"):
+                operations.append((1, 0, True))
+            case ("+", "old"):
+                operations.append((2, 0, False))
+            case ("*", operand):
+                operations.append((int(operand), 0, False))
+            case ("+", operand):
+                operations.append((1, int(operand), False))
+    mult, add, square = zip(*operations)
+    monkeys = [monkey_tracker[k] for k in range(len(monkey_tracker))]
+    return CompiledMonkeys(
+        mult=np.array(mult, dtype=np.int64),
+        add=np.array(add, dtype=np.int64),
+        square=np.array(square, dtype=bool),
+        modulus=np.array([monkey.modulus for monkey in monkeys], dtype=np.int64),
+        true_monkey=np.array([monkey.true_monkey for monkey in monkeys], dtype=np.int64),
+        false_monkey=np.array([monkey.false_monkey for monkey in monkeys], dtype=np.int64),
+    )
+
+
+def simulate_monkey_rounds_batched(monkey_tracker: MonkeyTracker, num_rounds: int, relief: bool) -> MonkeyTracker:
+    """Array version of `simulate_monkey_rounds` for monkeys holding plain integer items.
+
+    Each step inspects every item that is still due this round at once: an item keeps moving within a round while it
+    is thrown to a higher numbered monkey.  Without `relief` worry levels are kept modulo the lcm of all test moduli,
+    which leaves every test unchanged; with it they are floor divided by 3 and kept as exact Python integers.
+    """
+    monkeys = compile_monkeys(monkey_tracker)
+    num_monkeys = len(monkey_tracker)
+    modulus = math.lcm(*monkeys.modulus.tolist())
+    dtype = object if relief or (modulus - 1) ** 2 >= 2**63 else np.int64
+    targets = np.stack([monkeys.false_monkey, monkeys.true_monkey], axis=1).ravel()  # Indexed by 2 * owner + test
+    items = [(k, item) for k in range(num_monkeys) for item in monkey_tracker[k].held_items]
+    owners = np.array([owner for owner, _ in items], dtype=np.int64)
+    worry = np.array([item for _, item in items], dtype=dtype)
+    counts = np.zeros(num_monkeys, dtype=np.int64)
+    for _ in range(num_rounds):
+        due = np.arange(len(items))
+        while due.size:
+            owner, old = owners[due], worry[due]
+            counts += np.bincount(owner, minlength=num_monkeys)
+            new = old * np.where(monkeys.square[owner], old, monkeys.mult[owner]) + monkeys.add[owner]
+            new = new // 3 if relief else new % modulus
+            target = targets[2 * owner + (new % monkeys.modulus[owner] == 0).astype(np.int64)]
+            worry[due], owners[due] = new, target
+            due = due[target > owner]
+    for k in range(num_monkeys):
+        monkey_tracker[k].inspection_count += int(counts[k])
+        monkey_tracker[k].held_items = [int(item) for item in worry[owners == k]]
+    report_inspections(monkey_tracker)
+    return monkey_tracker
+
+
+def simulate_monkey_rounds_cyclic(monkey_tracker: MonkeyTracker, num_rounds: int) -> MonkeyTracker:
+    """`simulate_monkey_rounds` for the modular worry model, in time proportional to the items' cycle lengths.
+
+    Without relief, where an item goes during a round depends only on its state at the start of the round: its owner
+    and its worry level modulo the lcm of the test moduli.  That state sequence is therefore eventually periodic, so
+    each item is stepped only until a state repeats and the inspections of all later rounds are extrapolated from
+    those of one period.  Items starting from the same state share their trajectory.
+    """
+    monkeys = compile_monkeys(monkey_tracker)
+    mult, add, square, moduli, true_monkey, false_monkey = (column.tolist() for column in monkeys)
+    modulus = math.lcm(*moduli)
+    num_monkeys = len(monkey_tracker)
+    counts = [0] * num_monkeys
+    final_items: List[List[MonkeyItem]] = [[] for _ in range(num_monkeys)]
+    trajectories: Dict[Tuple[int, int], Tuple[List[int], Tuple[int, int]]] = {}  # Start -> inspections, end state
+    stepped_rounds = 0
+    for k in range(num_monkeys):
+        for item in monkey_tracker[k].held_items:
+            start = (k, cast(int, item) % modulus)
+            if start not in trajectories:
+                seen: Dict[Tuple[int, int], int] = {}  # State -> first round it was held at the start of
+                history: List[List[int]] = []  # Inspections per monkey before each round
+                inspected = [0] * num_monkeys
+                owner, worry = start
+                while (owner, worry) not in seen and len(seen) < num_rounds:
+                    seen[owner, worry] = len(history)
+                    history.append(inspected.copy())
+                    thrower = -1
+                    while owner > thrower:  # Items thrown to a higher numbered monkey move again this round
+                        inspected[owner] += 1
+                        factor = worry if square[owner] else mult[owner]
+                        worry = (worry * factor + add[owner]) % modulus
+                        thrower, owner = (
+                            owner,
+                            true_monkey[owner] if worry % moduli[owner] == 0 else false_monkey[owner],
+                        )
+                history.append(inspected)
+                stepped_rounds += len(seen)
+                states = list(seen)
+                if len(seen) == num_rounds:
+                    trajectories[start] = inspected, (owner, worry)
+                else:
+                    first = seen[owner, worry]
+                    periods, rest = divmod(num_rounds - first, len(seen) - first)
+                    loop, before = history[-1], history[first]
+                    total = [history[first + rest][m] + periods * (loop[m] - before[m]) for m in range(num_monkeys)]
+                    trajectories[start] = total, states[first + rest]
+            total, (owner, worry) = trajectories[start]
+            counts = [count + extra for count, extra in zip(counts, total)]
+            final_items[owner].append(worry)
+    instrument.count("day11.stepped_rounds", stepped_rounds)
+    for k in range(num_monkeys):
+        monkey_tracker[k].inspection_count += counts[k]
+        monkey_tracker[k].held_items = final_items[k]
+    report_inspections(monkey_tracker)
+    return monkey_tracker
+
+
+def get_monkey_business(
+    monkey_input: MonkeyList,
+    num_rounds: int,
+    use_ring_product: bool = False,
+    engine: Literal["item", "batch", "cycle"] = "item",
+) -> int:
+    match engine:
+        case "item":
+            monkey_state = initialize_monkey_state(monkey_input, use_ring_product)
+            monkey_state = simulate_monkey_rounds(monkey_state, num_rounds)
+        case "batch":
+            monkey_state = initialize_monkey_state(monkey_input)
+            monkey_state = simulate_monkey_rounds_batched(monkey_state, num_rounds, relief=not use_ring_product)
+        case "cycle":
+            if not use_ring_product:
+                raise ValueError("rounds only cycle under the modular worry model, without relief")
+            monkey_state = simulate_monkey_rounds_cyclic(initialize_monkey_state(monkey_input), num_rounds)
     monkiness = sorted([monkey.inspection_count for monkey in monkey_state.values()])
     return reduce(lambda m1, m2: m1 * m2, monkiness[-2:])
 
 
-# Tests
-monkey_input_test: MonkeyList = open("inputs/day11_test.txt").read().split("\n\n")
-assert get_monkey_business(monkey_input_test, num_rounds=20) == 10605
-# assert get_monkey_business(monkey_input_test, 10000, use_ring_product=True) == 2713310158
+PARTS = {
+    1: lambda path: get_monkey_business(open(path).read().split("\n\n"), num_rounds=20),
+    2: lambda path: get_monkey_business(
+        open(path).read().split("\n\n"), num_rounds=10000, use_ring_product=True, engine="cycle"
+    ),
+}
+
 
+if __name__ == "__main__":
+    # Tests
+    monkey_input_test: MonkeyList = open(input_path(11, test=True)).read().split("\n\n")
+    assert get_monkey_business(monkey_input_test, num_rounds=20) == 10605
+    assert get_monkey_business(monkey_input_test, num_rounds=20, engine="batch") == 10605
+    assert get_monkey_business(monkey_input_test, 1000, use_ring_product=True) == 27019168
+    assert get_monkey_business(monkey_input_test, 10000, use_ring_product=True, engine="batch") == 2713310158
+    assert get_monkey_business(monkey_input_test, 10000, use_ring_product=True, engine="cycle") == 2713310158
 
-monkey_input: MonkeyList = open("inputs/day11.txt").read().split("\n\n")
-print("Part 1: ", get_monkey_business(monkey_input, num_rounds=20))
-# print("Part 2: ", get_monkey_business(monkey_input, num_rounds=10000, use_ring_product=True))
+    monkey_input: MonkeyList = open(input_path(11)).read().split("\n\n")
+    print("Part 1: ", get_monkey_business(monkey_input, num_rounds=20))
+    print("Part 2: ", get_monkey_business(monkey_input, num_rounds=10000, use_ring_product=True, engine="cycle"))
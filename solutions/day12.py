@@ -1,9 +1,17 @@
 import math
-from collections import defaultdict
+import string
+from array import array
+from collections import defaultdict, deque
 from queue import PriorityQueue
-from typing import Dict, List, Optional, Tuple, TypeAlias, Union
+from typing import Dict, List, Optional, Sequence, Tuple, TypeAlias, Union
 
-Node: TypeAlias = Tuple[int, int]
+from solutions import input_path, instrument
+from solutions.grid import DenseGrid
+
+Node: TypeAlias = Tuple[int, int]  # (row_ix, col_ix), unlike the (x, y) coordinates of `DenseGrid`
+
+UNREACHED = -1
+HEIGHT_TABLE = bytes.maketrans(b"SE" + string.ascii_lowercase.encode(), bytes([0, 25]) + bytes(range(26)))
 
 
 class MountainGraph:
@@ -56,38 +64,118 @@ class MountainGraph:
         return neighbors
 
 
+class FlatMountainGraph:
+    """`MountainGraph` as a byte `DenseGrid` of heights, node (row_ix, col_ix) at `row_ix * ncols + col_ix`."""
+
+    def __init__(self, input_rows: List[str]):
+        rows = [row.encode() for row in input_rows if row]
+        self.nrows, self.ncols = len(rows), len(rows[0])
+        self.start, self.end = b"".join(rows).index(b"S"), b"".join(rows).index(b"E")
+        self.grid = DenseGrid.from_rows([row.translate(HEIGHT_TABLE) for row in rows])
+        self.heights = self.grid.cells
+
+    def index(self, node: Node) -> int:
+        return self.grid.index(node[1], node[0])
+
+    def node(self, index: int) -> Node:
+        col_ix, row_ix = self.grid.coord(index)
+        return row_ix, col_ix
+
+    def lowest_points(self) -> List[int]:
+        return self.grid.find_all(0)
+
+
+def bfs_climb(
+    mountain: FlatMountainGraph, sources: Sequence[int], target: Optional[int] = None, descent: bool = False
+) -> array:
+    """Steps from the nearest of `sources` to every node (UNREACHED if there is no path), stopping once `target` is
+    reached.  With `descent` every step is taken in reverse, giving the steps from each node to the sources."""
+    heights, ncols, size = mountain.heights, mountain.grid.width, len(mountain.heights)
+    dist = array("i", [UNREACHED]) * size
+    for source in sources:
+        dist[source] = 0
+    queue, pops = deque(sources), 0
+    while queue:
+        cur = queue.popleft()
+        pops += 1
+        if cur == target:
+            break
+        low, high = (heights[cur] - 1, 25) if descent else (0, heights[cur] + 1)
+        col, next_dist = cur % ncols, dist[cur] + 1
+        for node, on_map in (  # Neighbour checks inlined, this loop dominates the climb
+            (cur - ncols, cur >= ncols),
+            (cur + ncols, cur + ncols < size),
+            (cur - 1, col > 0),
+            (cur + 1, col < ncols - 1),
+        ):
+            if on_map and dist[node] == UNREACHED and low <= heights[node] <= high:
+                dist[node] = next_dist
+                queue.append(node)
+    instrument.count("day12.queue_pops", pops)
+    return dist
+
+
 def dijkstra_climb(mountain: MountainGraph, start_node: Optional[Node] = None, descent: bool = False) -> Dict:
     if start_node is not None:
         mountain.update_start_node(start_node, reverse_paths=descent)
     pqueue: PriorityQueue = PriorityQueue()
     pqueue.put((0, mountain.start_node))
+    pops = 0
     while not pqueue.empty():
         cur_d, cur_node = pqueue.get()
+        pops += 1
         for node in mountain.neighbors(cur_node):
             if cur_d + 1 < mountain.dist[node]:
                 mountain.update_dist(node, cur_d + 1)
                 pqueue.put((mountain.dist[node], node))
+    instrument.count("day12.queue_pops", pops)
     return mountain.dist
 
 
-def shortest_max_height_climb(mountain: MountainGraph) -> int:
+def shortest_climb(mountain: Union[MountainGraph, FlatMountainGraph]) -> Optional[int]:
+    """Fewest steps from S to E, None if E cannot be reached."""
+    if isinstance(mountain, FlatMountainGraph):
+        steps = bfs_climb(mountain, [mountain.start], target=mountain.end)[mountain.end]
+        return None if steps == UNREACHED else steps
+    dist = dijkstra_climb(mountain)[mountain.end_node]
+    return None if dist == math.inf else int(dist)
+
+
+def shortest_max_height_climb(mountain: Union[MountainGraph, FlatMountainGraph]) -> Optional[int]:
+    """Fewest steps to E from any lowest point, None if E cannot be reached from one."""
+    if isinstance(mountain, FlatMountainGraph):
+        steps = bfs_climb(mountain, mountain.lowest_points(), target=mountain.end)[mountain.end]
+        return None if steps == UNREACHED else steps
     start_points = [node for node, height in mountain.nodes.items() if height == 0]
     shortest = math.inf
     path_dists = dijkstra_climb(mountain, start_node=mountain.end_node, descent=True)
     for node in start_points:
         shortest = min(shortest, path_dists[node])
-    return int(shortest)
+    return None if shortest == math.inf else int(shortest)
+
 
+PARTS = {
+    1: lambda path: shortest_climb(FlatMountainGraph(open(path).read().split("\n"))),
+    2: lambda path: shortest_max_height_climb(FlatMountainGraph(open(path).read().split("\n"))),
+}
 
-# Tests
-mountain_rows_test = open("inputs/day12_test.txt").read().split("\n")
-mountain_graph = MountainGraph(mountain_rows_test)
-path_dists = dijkstra_climb(mountain_graph)
-assert path_dists[mountain_graph.end_node] == 31
 
+if __name__ == "__main__":
+    # Tests
+    mountain_rows_test = open(input_path(12, test=True)).read().split("\n")
+    mountain_graph = MountainGraph(mountain_rows_test)
+    path_dists = dijkstra_climb(mountain_graph)
+    assert path_dists[mountain_graph.end_node] == 31
+    flat_mountain = FlatMountainGraph(mountain_rows_test)
+    assert shortest_climb(flat_mountain) == 31
+    assert shortest_max_height_climb(flat_mountain) == 29
+    walled_rows = ["SazE"]  # The wall of z's is too high to climb
+    assert shortest_climb(FlatMountainGraph(walled_rows)) is shortest_climb(MountainGraph(walled_rows)) is None
+    assert shortest_max_height_climb(FlatMountainGraph(walled_rows)) is None
+    descent_dists = bfs_climb(flat_mountain, [flat_mountain.end], descent=True)
+    assert min(descent_dists[ix] for ix in flat_mountain.lowest_points() if descent_dists[ix] != UNREACHED) == 29
 
-mountain_rows = open("inputs/day12.txt").read().split("\n")
-mountain_graph = MountainGraph(mountain_rows)
-path_dists = dijkstra_climb(mountain_graph)
-print("Part 1: ", path_dists[mountain_graph.end_node])
-print("Part 2: ", shortest_max_height_climb(mountain_graph))
+    mountain_rows = open(input_path(12)).read().split("\n")
+    flat_mountain = FlatMountainGraph(mountain_rows)
+    print("Part 1: ", shortest_climb(flat_mountain))
+    print("Part 2: ", shortest_max_height_climb(flat_mountain))
@@ -1,7 +1,14 @@
-from functools import cmp_to_key, reduce
-from typing import List, Literal, Optional, TypeAlias, Union, cast
+from functools import cmp_to_key
+from pathlib import Path
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, TypeAlias, Union, cast
+
+from solutions import input_path, instrument
 
 Packet: TypeAlias = List[Union[int, "Packet"]]
+PacketKey: TypeAlias = Tuple[int, ...]
+
+OPEN, CLOSE = -1, -2  # Key tokens around lists; CLOSE is lowest so a list that runs out first sorts first
+DIVIDERS: List[Packet] = [[[2]], [[6]]]
 
 
 def parse_packet_wo_eval(raw_packet_str: str) -> Packet:
@@ -28,19 +35,19 @@ def parse_packet_wo_eval(raw_packet_str: str) -> Packet:
     return lists[0]
 
 
-def load_packets(test=False):
-    test_path_mod = "_test" * test
+def load_packets(path: Path = input_path(13)) -> List[List[Packet]]:
     return [
         [parse_packet_wo_eval(packet_string) for packet_string in block.split("\n")]
-        for block in open(f"inputs/day13{test_path_mod}.txt").read().split("\n\n")
+        for block in open(path).read().split("\n\n")
     ]
 
 
 def packet_relation(p_left: Packet, p_right: Packet) -> Optional[bool]:
     p_left, p_right = p_left.copy(), p_right.copy()
-    comparison = None
+    comparison, comparisons = None, 0
     while p_left and p_right and comparison is None:
         comp_items = [p_left.pop(0), p_right.pop(0)]
+        comparisons += 1
         match comp_items:
             case [k, j] if (type(k) == int) and (type(j) == int):
                 if cast(int, k) < cast(int, j):
@@ -53,6 +60,7 @@ def packet_relation(p_left: Packet, p_right: Packet) -> Optional[bool]:
                 comparison = packet_relation(cast(Packet, p), [q])
             case [p, q] if (type(p) == list) and (type(q) == list):
                 comparison = packet_relation(cast(Packet, p), cast(Packet, q))
+    instrument.count("day13.comparisons", comparisons)
     if comparison is None and p_left and not p_right:
         return False
     if comparison is None and not p_left and p_right:
@@ -65,25 +73,184 @@ def packet_comparator(p_left, p_right) -> Literal[-1, 0, 1]:
     return cast(Literal[1, -1], (2 * int(left_comp_right) - 1)) if left_comp_right is not None else 0
 
 
-# Tests
-assert parse_packet_wo_eval("[1,1,3,1,1]") == [1, 1, 3, 1, 1]
-assert parse_packet_wo_eval("[1,[231,[3,[4,[5,6,70]]]],80,9]") == [1, [231, [3, [4, [5, 6, 70]]]], 80, 9]
-assert parse_packet_wo_eval("[1,[2,[3,[4,[5,6,7]]]],8,9]") == [1, [2, [3, [4, [5, 6, 7]]]], 8, 9]
-packet_pairs_test = load_packets(test=True)
-expected_test = {0: True, 1: True, 2: False, 3: True, 4: False, 5: True, 6: False, 7: False}
-assert all([packet_relation(packet_pairs_test[k][0], packet_pairs_test[k][1]) == expected_test[k] for k in range(8)])
-assert sum([(k + 1) for k, packet in enumerate(packet_pairs_test) if packet_relation(packet[0], packet[1])]) == 13
-sorted_test_packets_w_buffers = sorted(
-    reduce(lambda l1, l2: l1 + l2, packet_pairs_test + [[[[2]], [[6]]]]),
-    key=cmp_to_key(packet_comparator),
-    reverse=True,
-)
-assert (sorted_test_packets_w_buffers.index([[2]]) == 9) and (sorted_test_packets_w_buffers.index([[6]]) == 13)
-
-packet_pairs = load_packets()
-true_packet_ix = [(k + 1) for k, packet in enumerate(packet_pairs) if packet_relation(packet[0], packet[1])]
-print("Part 1: ", sum(true_packet_ix))
-sorted_packets_w_buffers = sorted(
-    reduce(lambda l1, l2: l1 + l2, packet_pairs + [[[[2]], [[6]]]]), key=cmp_to_key(packet_comparator), reverse=True
-)
-print("Part 2: ", (1 + sorted_packets_w_buffers.index([[2]])) * (1 + sorted_packets_w_buffers.index([[6]])))
+def packet_depth(packet: Packet) -> int:
+    """Deepest list nesting in `packet`, the packet itself being at depth 1."""
+    depth, stack = 0, [(packet, 1)]
+    while stack:
+        items, level = stack.pop()
+        depth = max(depth, level)
+        stack.extend((cast(Packet, item), level + 1) for item in items if isinstance(item, list))
+    return depth
+
+
+def packet_key(packet: Packet, depth: int) -> PacketKey:
+    """Flat tuple that orders like `packet_relation` against the key of any packet no deeper than `depth`.
+
+    Wrapping an int in a list never changes a comparison, so every int is wrapped down to one below `depth`: lists
+    then only ever meet lists and ints only ints, and the nested packet orders exactly like its token stream.
+    """
+    key, stack = [OPEN], [(iter(packet), 1)]
+    while stack:
+        items, level = stack[-1]
+        item = next(items, None)
+        if item is None:
+            key.append(CLOSE)
+            stack.pop()
+        elif isinstance(item, list):
+            key.append(OPEN)
+            stack.append((iter(cast(Packet, item)), level + 1))
+        else:
+            key.extend([OPEN] * (depth - level) + [cast(int, item)] + [CLOSE] * (depth - level))
+    return tuple(key)
+
+
+def packet_keys(packets: List[Packet]) -> List[PacketKey]:
+    """Keys of `packets` that order all of them, which pads every int down to the deepest packet's depth."""
+    depth = max(map(packet_depth, packets), default=1)
+    keys = [packet_key(packet, depth) for packet in packets]
+    instrument.count("day13.key_tokens", sum(map(len, keys)))
+    return keys
+
+
+def ordered_pair_index_sum(packet_pairs: List[List[Packet]], method: Literal["relation", "key"] = "relation") -> int:
+    if method == "key":  # Each pair is keyed at its own depth, so one deep packet does not inflate every key
+        index_sum, tokens = 0, 0
+        for k, (left, right) in enumerate(packet_pairs):
+            depth = max(packet_depth(left), packet_depth(right))
+            left_key, right_key = packet_key(left, depth), packet_key(right, depth)
+            tokens += len(left_key) + len(right_key)
+            index_sum += k + 1 if left_key < right_key else 0
+        instrument.count("day13.key_tokens", tokens)
+        instrument.count("day13.comparisons", len(packet_pairs))
+        return index_sum
+    return sum([(k + 1) for k, packet in enumerate(packet_pairs) if packet_relation(packet[0], packet[1])])
+
+
+def decoder_key(packet_pairs: List[List[Packet]], method: Literal["sort", "count"] = "sort") -> int:
+    """Product of the 1-based positions of the divider packets once all packets are in order.
+
+    With `method="count"` nothing is sorted: a divider's position is one plus the number of packets keyed below or
+    equal to it, since the stable sort leaves packets that compare equal to a divider before it.  Packets are only
+    ever compared with the dividers, so each is keyed at its own depth against divider keys of that depth.
+    """
+    if method == "count":
+        positions, tokens = [1, 2], 0
+        divider_keys: Dict[int, List[PacketKey]] = {}
+        for packet in (packet for pair in packet_pairs for packet in pair):
+            depth = max(packet_depth(packet), 2)
+            if depth not in divider_keys:
+                divider_keys[depth] = [packet_key(divider, depth) for divider in DIVIDERS]
+            key = packet_key(packet, depth)
+            tokens += len(key)
+            for k, divider_key in enumerate(divider_keys[depth]):
+                positions[k] += key <= divider_key
+        instrument.count("day13.key_tokens", tokens)
+        instrument.count("day13.comparisons", 2 * sum(map(len, packet_pairs)))
+        return positions[0] * positions[1]
+    packets_w_buffers = [packet for pair in packet_pairs for packet in pair] + DIVIDERS
+    sorted_packets_w_buffers = sorted(packets_w_buffers, key=cmp_to_key(packet_comparator), reverse=True)
+    return (1 + sorted_packets_w_buffers.index([[2]])) * (1 + sorted_packets_w_buffers.index([[6]]))
+
+
+def packet_tokens(raw_packet: bytes) -> Iterator[int]:
+    """The OPEN / CLOSE markers and ints of a raw packet, read lazily from any bytes-like object."""
+    number = None
+    for byte in raw_packet:
+        if 48 <= byte <= 57:  # An ASCII digit
+            number = byte - 48 if number is None else 10 * number + byte - 48
+            continue
+        if number is not None:
+            yield number
+            number = None
+        if byte == 91:  # "["
+            yield OPEN
+        elif byte == 93:  # "]"
+            yield CLOSE
+
+
+def raw_packet_relation(left: bytes, right: bytes) -> Optional[bool]:
+    """`packet_relation` on raw packets, walking both token streams side by side without parsing or recursing.
+
+    An int meeting a list is promoted on the fly: the list's OPEN is consumed and the int followed by a CLOSE is
+    pushed back onto its side, so it is compared as a one element list.  The walk stops at the first deciding token.
+    """
+    streams = packet_tokens(left), packet_tokens(right)
+    pending: Tuple[List[int], List[int]] = ([], [])  # Tokens pushed back on each side, next one last
+    relation, comparisons = None, 0
+    while True:
+        a, b = [pending[k].pop() if pending[k] else next(streams[k], None) for k in range(2)]
+        comparisons += 1
+        if a == b:
+            if a is None:
+                break
+            continue
+        if a is None or b is None:  # Only malformed packets run out on one side alone
+            relation = a is None
+        elif a >= 0 and b >= 0:
+            relation = a < b
+        elif a == CLOSE or b == CLOSE:
+            relation = a == CLOSE
+        else:
+            pending[1 if a == OPEN else 0].extend([CLOSE, max(a, b)])  # The int of the pair, as a one element list
+            continue
+        break
+    instrument.count("day13.comparisons", comparisons)
+    return relation
+
+
+def stream_pairs(path: Path = input_path(13)) -> Iterator[Tuple[bytes, bytes]]:
+    """The raw packet pairs of the file, read a line at a time."""
+    with open(path, "rb") as handle:
+        packets = (line.strip() for line in handle if line.strip())
+        yield from zip(packets, packets)
+
+
+def streamed_pair_index_sum(path: Path = input_path(13)) -> int:
+    return sum(k for k, (left, right) in enumerate(stream_pairs(path), 1) if raw_packet_relation(left, right))
+
+
+PARTS = {
+    1: streamed_pair_index_sum,
+    2: lambda path: decoder_key(load_packets(path), method="count"),
+}
+
+
+if __name__ == "__main__":
+    # Tests
+    assert parse_packet_wo_eval("[1,1,3,1,1]") == [1, 1, 3, 1, 1]
+    assert parse_packet_wo_eval("[1,[231,[3,[4,[5,6,70]]]],80,9]") == [1, [231, [3, [4, [5, 6, 70]]]], 80, 9]
+    assert parse_packet_wo_eval("[1,[2,[3,[4,[5,6,7]]]],8,9]") == [1, [2, [3, [4, [5, 6, 7]]]], 8, 9]
+    packet_pairs_test = load_packets(input_path(13, test=True))
+    expected_test = {0: True, 1: True, 2: False, 3: True, 4: False, 5: True, 6: False, 7: False}
+    assert all(
+        [packet_relation(packet_pairs_test[k][0], packet_pairs_test[k][1]) == expected_test[k] for k in range(8)]
+    )
+    assert ordered_pair_index_sum(packet_pairs_test) == 13
+    assert decoder_key(packet_pairs_test) == 140
+    assert ordered_pair_index_sum(packet_pairs_test, method="key") == 13
+    assert decoder_key(packet_pairs_test, method="count") == 140
+    tied_pairs_test = packet_pairs_test + [[[2], [[[6]]]]]  # Both compare equal to a divider
+    assert decoder_key(tied_pairs_test) == decoder_key(tied_pairs_test, method="count") == 11 * 16
+    deep_packet: Packet = [3]
+    for _ in range(299):  # Nested 300 deep, which must not inflate the keys of the other packets
+        deep_packet = [deep_packet]
+    deep_pairs_test = packet_pairs_test + [[deep_packet, [4]]]
+    assert decoder_key(deep_pairs_test) == decoder_key(deep_pairs_test, method="count") == 10 * 16
+    assert ordered_pair_index_sum(deep_pairs_test, method="key") == ordered_pair_index_sum(deep_pairs_test) == 13 + 9
+    assert packet_key([[1], 4], 2) > packet_key([1, 3], 2) and packet_key([[]], 2) > packet_key([], 2)
+    assert [raw_packet_relation(*pair) for pair in stream_pairs(input_path(13, test=True))] == list(
+        expected_test.values()
+    )
+    assert streamed_pair_index_sum(input_path(13, test=True)) == 13
+    assert raw_packet_relation(b"[" * 5000 + b"1" + b"]" * 5000, b"[" * 4000 + b"2" + b"]" * 4000)
+    assert raw_packet_relation(b"[1,[2]]", b"[[1],2]") is None
+    assert packet_key([[[7]]], 3) == packet_key([7], 3) and packet_key([[1, 2]], 2) > packet_key([1, 2], 2)
+
+    packet_pairs = load_packets()
+    flat_packets = [packet for pair in packet_pairs for packet in pair]
+    assert sorted(flat_packets, key=cmp_to_key(packet_comparator), reverse=True) == [
+        flat_packets[k] for k in sorted(range(len(flat_packets)), key=packet_keys(flat_packets).__getitem__)
+    ]
+    assert [raw_packet_relation(*pair) for pair in stream_pairs()] == [packet_relation(*pair) for pair in packet_pairs]
+    print("Part 1: ", streamed_pair_index_sum())
+    print("Part 2: ", decoder_key(packet_pairs, method="count"))
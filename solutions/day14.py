@@ -1,13 +1,30 @@
-from collections import defaultdict
-from typing import Dict, List, Tuple, TypeAlias, cast
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, TypeAlias, cast
 
-Coord: TypeAlias = Tuple[int, int]
-CaveState: TypeAlias = Dict[Coord, str]
+import numpy as np
+
+from solutions import input_path, instrument
+from solutions.grid import Coord, DenseGrid, SparseGrid
+
+Segment: TypeAlias = Tuple[Coord, Coord]
+
+AIR, ROCK, SAND = 0, 1, 2
+CELL_CHARS = ".#o"
+
+
+def rock_segments(scans: List[str]) -> List[Segment]:
+    segments: List[Segment] = []
+    for scan in scans:
+        if not scan.strip():  # Blank lines, such as after a trailing newline
+            continue
+        points = [cast(Coord, tuple(int(v) for v in point.split(","))) for point in scan.split(" -> ")]
+        segments.extend(zip(points, points[1:]))
+    return segments
 
 
 class Cave:
     def __init__(self, scans: List[str]):
-        self.cave_state: CaveState = defaultdict(lambda: ".")
+        self.cave_state = SparseGrid(default=AIR)
         self.xmin = None
         self.xmax = None
         self.ymax = None
@@ -22,27 +39,29 @@ class Cave:
                 self.ymax = max(y1, y2) if self.ymax is None else max(y1, y2, self.ymax)
                 if x1 == x2:
                     for y in range(min(y1, y2), max(y1, y2) + 1):
-                        self.cave_state[(x1, y)] = "#"
+                        self.cave_state.set(x1, y, ROCK)
                 elif y1 == y2:
                     for x in range(min(x1, x2), max(x1, x2) + 1):
-                        self.cave_state[(x, y1)] = "#"
+                        self.cave_state.set(x, y1, ROCK)
 
     def sand_drop(self, void: bool):
         pos = (500, 0)
-        sand_falling = True
+        sand_falling, steps = True, 0
         while sand_falling:
+            steps += 1
             if pos[1] == cast(int, self.ymax) + 1:
                 sand_falling = False  # into the abyss / floor
-            elif self.cave_state[(pos[0], pos[1] + 1)] == ".":
+            elif self.cave_state.get(pos[0], pos[1] + 1) == AIR:
                 pos = (pos[0], pos[1] + 1)
-            elif self.cave_state[(pos[0] - 1, pos[1] + 1)] == ".":
+            elif self.cave_state.get(pos[0] - 1, pos[1] + 1) == AIR:
                 pos = (pos[0] - 1, pos[1] + 1)
-            elif self.cave_state[(pos[0] + 1, pos[1] + 1)] == ".":
+            elif self.cave_state.get(pos[0] + 1, pos[1] + 1) == AIR:
                 pos = (pos[0] + 1, pos[1] + 1)
             else:
                 sand_falling = False
+        instrument.count("day14.sand_steps", steps)
         if pos[1] < cast(int, self.ymax) or not void:
-            self.cave_state[pos] = "o"
+            self.cave_state.set(*pos, SAND)
             self.xmax = max(cast(int, self.xmax), pos[0])
             self.xmin = min(cast(int, self.xmin), pos[0])
             self.sand_grains += 1
@@ -56,29 +75,268 @@ class Cave:
             sand_grains = self.sand_grains
 
     def fill_with_sand_floor(self):
-        while self.cave_state[(500, 0)] == ".":
+        while self.cave_state.get(500, 0) == AIR:
             self.sand_drop(void=False)
 
     def __repr__(self):
         rows = [
-            "".join([self.cave_state[(x, y)] for x in range(cast(int, self.xmin), cast(int, self.xmax) + 1)])
+            "".join(
+                CELL_CHARS[self.cave_state.get(x, y)] for x in range(cast(int, self.xmin), cast(int, self.xmax) + 1)
+            )
             for y in range(cast(int, self.ymax) + 1)
         ]
         return "\n".join(rows)
 
 
-# Tests
-test_scans = open("inputs/day14_test.txt").read().split("\n")
-cave1, cave2 = Cave(test_scans), Cave(test_scans)
-cave1.fill_with_sand_void()
-cave2.fill_with_sand_floor()
-assert cave1.sand_grains == 24
-assert cave2.sand_grains == 93
+class DenseCave:
+    """`Cave` stored in a byte `DenseGrid` with its origin at (x0, 0), covering every cell sand can reach.
+
+    The grid spans rows 0 to `ymax + 1` and is wide enough for the whole sand triangle under (500, 0), so the floor
+    at `ymax + 2` never needs storing.  Fills keep the path of the falling grain as a stack: when a grain settles the
+    next one resumes from the position just above it instead of starting again at the source.
+    """
+
+    def __init__(self, scans: List[str]):
+        segments = rock_segments(scans)
+        self.xmin = min(x for segment in segments for x, _ in segment)
+        self.xmax = max(x for segment in segments for x, _ in segment)
+        self.ymax = max(y for segment in segments for _, y in segment)
+        self.sand_grains = 0
+        height = self.ymax + 2
+        x0 = min(self.xmin, 500 - height)
+        self.grid = DenseGrid(x0, 0, max(self.xmax, 500 + height) - x0 + 1, height)
+        for start, end in segments:
+            self.grid.fill_line(start, end, ROCK)
+        self.path = [self.grid.index(500, 0)]  # Falling path of the current grain, source first
+
+    def cell(self, x: int, y: int) -> str:
+        return CELL_CHARS[self.grid.get(x, y, AIR)]
+
+    def fill(self, void: bool):
+        grid, width, x0, path = self.grid.cells, self.grid.width, self.grid.x0, self.path
+        floor_row = (self.grid.height - 1) * width
+        steps = 0
+        while path:
+            pos = path[-1]
+            steps += 1
+            if pos < floor_row:
+                below = pos + width
+                if grid[below] == AIR:
+                    path.append(below)
+                    continue
+                if grid[below - 1] == AIR:
+                    path.append(below - 1)
+                    continue
+                if grid[below + 1] == AIR:
+                    path.append(below + 1)
+                    continue
+            elif void:
+                break  # Past the lowest rock, this and every later grain falls into the abyss
+            grid[path.pop()] = SAND
+            self.sand_grains += 1
+            self.xmin = min(self.xmin, pos % width + x0)
+            self.xmax = max(self.xmax, pos % width + x0)
+        instrument.count("day14.sand_steps", steps)
+
+    def fill_with_sand_void(self):
+        self.fill(void=True)
+
+    def fill_with_sand_floor(self):
+        self.fill(void=False)
+
+    def sweep_floor(self):
+        """Settle the same sand as `fill_with_sand_floor` a row at a time, without dropping single grains.
+
+        With a floor nothing escapes, so the final pile holds exactly the cells sand can reach: (500, 0), and then
+        every cell that is not rock below a sand cell or diagonally below one.
+        """
+        rows = np.frombuffer(self.grid.cells, dtype=np.uint8).reshape(self.grid.height, self.grid.width)
+        reach = np.zeros(self.grid.width, dtype=bool)
+        reach[500 - self.grid.x0] = True
+        for row in rows:
+            reach &= row != ROCK
+            row[reach] = SAND
+            below = reach.copy()
+            below[1:] |= reach[:-1]
+            below[:-1] |= reach[1:]
+            reach = below
+        settled = rows == SAND
+        columns = np.flatnonzero(settled.any(axis=0)) + self.grid.x0
+        self.sand_grains = int(settled.sum())
+        self.xmin, self.xmax = min(self.xmin, int(columns[0])), max(self.xmax, int(columns[-1]))
+        self.path.clear()  # The source is covered, no grain falls any more
+        instrument.count("day14.sweep_rows", len(rows))
+
+    def __repr__(self):
+        rows = ["".join([self.cell(x, y) for x in range(self.xmin, self.xmax + 1)]) for y in range(self.ymax + 1)]
+        return "\n".join(rows)
+
+
+class ColumnCave:
+    """`Cave` storing blocked cells as sorted, disjoint (start, end) row intervals per column.
+
+    Vertical rock segments are kept as single intervals of their column and horizontal ones as (x1, x2, y) row spans,
+    so neither tall nor wide scans cost anything per cell.  A column's interval list is only built, from the segments
+    crossing it, when a grain first needs it.  A falling grain jumps straight to the first blocked cell below it by
+    binary search, and a settled grain simply extends the interval it lands on upwards.  Sand is also kept in a
+    `SparseGrid` to tell it apart from rock when rendering, which only probes the requested window.
+    """
+
+    def __init__(self, scans: List[str]):
+        segments = rock_segments(scans)
+        self.xmin = min(x for segment in segments for x, _ in segment)
+        self.xmax = max(x for segment in segments for x, _ in segment)
+        self.ymax = max(y for segment in segments for _, y in segment)
+        self.floor: Optional[int] = None
+        self.sand = SparseGrid(default=AIR)
+        self.sand_grains = 0
+        self.vertical: Dict[int, List[Tuple[int, int]]] = {}
+        spans = []
+        for (x1, y1), (x2, y2) in segments:
+            if x1 == x2:
+                self.vertical.setdefault(x1, []).append((min(y1, y2), max(y1, y2)))
+            else:
+                spans.append((min(x1, x2), max(x1, x2), y1))
+        self.spans = np.array(spans, dtype=np.int64).reshape(-1, 3)
+        self.starts: Dict[int, List[int]] = {}
+        self.ends: Dict[int, List[int]] = {}
+
+    def column(self, x: int) -> Tuple[List[int], List[int]]:
+        """Starts and ends of the blocked intervals of column `x`, merging its rock on first use."""
+        if x not in self.starts:
+            x1, x2, y = self.spans.T
+            rows = y[(x1 <= x) & (x <= x2)].tolist()
+            starts, ends = self.starts.setdefault(x, []), self.ends.setdefault(x, [])
+            for start, end in sorted(self.vertical.get(x, []) + [(row, row) for row in rows]):
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+        return self.starts[x], self.ends[x]
+
+    def occupied(self, x: int, y: int) -> bool:
+        starts, ends = self.column(x)
+        k = bisect_right(starts, y) - 1
+        return k >= 0 and ends[k] >= y
+
+    def blocked(self, x: int, y: int) -> bool:
+        return self.floor is not None and y >= self.floor or self.occupied(x, y)
+
+    def fall(self, x: int, y: int) -> Optional[Coord]:
+        """Where a grain falling straight down from the free cell (x, y) comes to rest, None for the abyss."""
+        starts, _ = self.column(x)
+        k = bisect_right(starts, y)
+        if k < len(starts):
+            return x, starts[k] - 1
+        return None if self.floor is None else (x, self.floor - 1)
+
+    def settle(self, x: int, y: int):
+        starts, ends = self.column(x)
+        k = bisect_right(starts, y)
+        if k < len(starts) and starts[k] == y + 1:
+            starts[k] = y
+        else:  # Resting on the floor
+            starts.insert(k, y)
+            ends.insert(k, y)
+        if k > 0 and ends[k - 1] == y - 1:
+            ends[k - 1] = ends.pop(k)
+            del starts[k]
+        self.sand.set(x, y, SAND)
+        self.sand_grains += 1
+        self.xmin, self.xmax = min(self.xmin, x), max(self.xmax, x)
+
+    def fill(self, void: bool):
+        """Keep the resting points of the falling grain as a stack, resuming the next grain from the one before."""
+        self.floor = None if void else self.ymax + 2
+        path: List[Coord] = []
+        steps = 0
+        while path or not self.blocked(500, 0):
+            steps += 1
+            if path:
+                x, y = path[-1]
+                side = next((side for side in (x - 1, x + 1) if not self.blocked(side, y + 1)), None)
+                if side is None:
+                    self.settle(*path.pop())
+                    continue
+                landing = self.fall(side, y + 1)
+            else:
+                landing = self.fall(500, 0)
+            if landing is None:
+                break  # Into the abyss, as is every later grain
+            path.append(landing)
+        instrument.count("day14.sand_steps", steps)
+
+    def fill_with_sand_void(self):
+        self.fill(void=True)
+
+    def fill_with_sand_floor(self):
+        self.fill(void=False)
+
+    def cell(self, x: int, y: int) -> str:
+        if self.sand.get(x, y) == SAND:
+            return CELL_CHARS[SAND]
+        return CELL_CHARS[ROCK] if self.occupied(x, y) else CELL_CHARS[AIR]
+
+    def render(
+        self, xmin: Optional[int] = None, xmax: Optional[int] = None, ymin: int = 0, ymax: Optional[int] = None
+    ) -> Iterator[str]:
+        """Rows of the window, by default the whole cave as in `__repr__`, one at a time."""
+        xmin = self.xmin if xmin is None else xmin
+        xmax = self.xmax if xmax is None else xmax
+        for y in range(ymin, (self.ymax if ymax is None else ymax) + 1):
+            yield "".join([self.cell(x, y) for x in range(xmin, xmax + 1)])
+
+    def __repr__(self):
+        return "\n".join(self.render())
+
+
+def sand_capacity(scans: List[str], floor: bool, backend: Literal["dict", "dense", "sweep", "columns"] = "dict") -> int:
+    """Grains settled with or without a floor; the "sweep" backend is `DenseCave` filling the floor variant by rows."""
+    cave = Cave(scans) if backend == "dict" else ColumnCave(scans) if backend == "columns" else DenseCave(scans)
+    with instrument.span(f"day14.{backend}_fill"):
+        if floor and backend == "sweep":
+            cast(DenseCave, cave).sweep_floor()
+        elif floor:
+            cave.fill_with_sand_floor()
+        else:
+            cave.fill_with_sand_void()
+    instrument.count("day14.sand_grains", cave.sand_grains)
+    return cave.sand_grains
+
+
+PARTS = {
+    1: lambda path: sand_capacity(open(path).read().split("\n"), floor=False, backend="dense"),
+    2: lambda path: sand_capacity(open(path).read().split("\n"), floor=True, backend="sweep"),
+}
+
 
+if __name__ == "__main__":
+    # Tests
+    test_scans = open(input_path(14, test=True)).read().split("\n")
+    cave1, cave2 = Cave(test_scans), Cave(test_scans)
+    cave1.fill_with_sand_void()
+    cave2.fill_with_sand_floor()
+    assert cave1.sand_grains == 24
+    assert cave2.sand_grains == 93
+    dense1, dense2 = DenseCave(test_scans), DenseCave(test_scans)
+    dense1.fill_with_sand_void()
+    dense2.fill_with_sand_floor()
+    assert (dense1.sand_grains, repr(dense1)) == (24, repr(cave1))
+    assert (dense2.sand_grains, repr(dense2)) == (93, repr(cave2))
+    assert sand_capacity(test_scans + ["", " "], floor=True, backend="dense") == 93
+    columns1, columns2 = ColumnCave(test_scans), ColumnCave(test_scans)
+    columns1.fill_with_sand_void()
+    columns2.fill_with_sand_floor()
+    assert (columns1.sand_grains, repr(columns1)) == (24, repr(cave1))
+    assert (columns2.sand_grains, repr(columns2)) == (93, repr(cave2))
+    wide = ColumnCave(["0,10 -> 3000000,10"])
+    wide.fill_with_sand_void()
+    assert wide.sand_grains == 100 and list(wide.render(499, 501, 9, 10)) == ["ooo", "###"]
+    swept = DenseCave(test_scans)
+    swept.sweep_floor()
+    assert (swept.sand_grains, repr(swept)) == (93, repr(cave2))
 
-scans = open("inputs/day14.txt").read().split("\n")
-cave1, cave2 = Cave(scans), Cave(scans)
-cave1.fill_with_sand_void()
-cave2.fill_with_sand_floor()
-print("Part 1: ", cave1.sand_grains)
-print("Part 2: ", cave2.sand_grains)
+    scans = open(input_path(14)).read().split("\n")
+    print("Part 1: ", sand_capacity(scans, floor=False, backend="dense"))
+    print("Part 2: ", sand_capacity(scans, floor=True, backend="sweep"))
@@ -1,14 +1,19 @@
-from functools import reduce
+import os
 import re
 from collections import defaultdict
-from typing import List, Optional, Tuple, TypeAlias
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import DefaultDict, Dict, List, Literal, NamedTuple, Optional, Tuple, TypeAlias
 
-Coord: TypeAlias = Tuple[int, int]
-ClosedInterval: TypeAlias = Tuple[int, int]
+import numpy as np
 
+from solutions import input_path
+from solutions.grid import Coord, l1_dist
 
-def l1_dist(c1: Coord, c2: Coord) -> int:
-    return abs(c1[0] - c2[0]) + abs(c1[1] - c2[1])
+ClosedInterval: TypeAlias = Tuple[int, int]
+
+FAR = 1 << 62  # Beyond any coordinate, marks empty intervals in `SensorGrid.row_coverage`
+BLOCK_CELLS = 1 << 20  # Rows x sensors handled per array operation
 
 
 def interval_union(intervals: List[ClosedInterval]) -> List[ClosedInterval]:
@@ -24,6 +29,14 @@ def interval_union(intervals: List[ClosedInterval]) -> List[ClosedInterval]:
     return res
 
 
+class RowCoverage(NamedTuple):
+    """Per row from `y_start` on, how many positions some sensor covers and, for rows that have any, the gaps."""
+
+    y_start: int
+    covered: np.ndarray
+    gaps: Dict[int, List[ClosedInterval]]
+
+
 class AffineRelation:
     def __init__(self, c1: Coord, c2: Coord):
         self.A = c1[1] - c2[1]
@@ -66,7 +79,107 @@ class SensorGrid:
                 intervals.append((sensor[0] - dx, sensor[0] + dx))
         return sum([(1 + intv[1] - intv[0]) for intv in interval_union(intervals)]) - len(self.beacons[y_pos])
 
-    def get_signal_tuning_freq(self, max_xy: int) -> int:
+    def row_coverage(
+        self, y_start: int, y_end: int, x_min: Optional[int] = None, x_max: Optional[int] = None
+    ) -> RowCoverage:
+        """Coverage of the rows `y_start` to `y_end` (excluded), clipped to [x_min, x_max] when those are given.
+
+        A sensor's interval on row y is its x coordinate -/+ (D - |sensor y - y|), so a whole block of rows is
+        computed at once from the sensor arrays.  This is a vectorised per-row sort, not an incremental sweep: every
+        row's intervals are argsorted by left end afresh, costing rows x sensors x log(sensors), and one running
+        maximum of right ends gives the covered count and the gaps.  Without a window, gaps are only reported between
+        covered stretches.
+        """
+        sx, sy, reach = np.array([(*sensor, D) for sensor, D in self.sensors.items()], dtype=np.int64).T
+        window = (x_min, x_max) if x_min is not None and x_max is not None else None
+        start = window[0] - 1 if window is not None else -FAR
+        block = max(1, BLOCK_CELLS // len(sx))
+        covered = []
+        gaps: Dict[int, List[ClosedInterval]] = {}
+        for y0 in range(y_start, y_end, block):
+            rows = np.arange(y0, min(y0 + block, y_end), dtype=np.int64)
+            half = reach - np.abs(rows[:, None] - sy)
+            left, right = sx - half, sx + half
+            if window is not None:
+                left, right = np.maximum(left, window[0]), np.minimum(right, window[1])
+            empty = left > right
+            left[empty], right[empty] = FAR, -FAR
+            order = np.argsort(left, axis=1)
+            left, right = np.take_along_axis(left, order, axis=1), np.take_along_axis(right, order, axis=1)
+            reached = np.maximum.accumulate(np.hstack([np.full((len(rows), 1), start), right]), axis=1)
+            before = reached[:, :-1]  # Rightmost covered position left of each interval
+            covered.append(np.maximum(0, right - np.maximum(left - 1, before)).sum(axis=1))
+            for k, ix in zip(*np.nonzero((left > before + 1) & (left < FAR) & (before > -FAR))):
+                gaps.setdefault(int(rows[k]), []).append((int(before[k, ix]) + 1, int(left[k, ix]) - 1))
+            if window is not None:
+                for k in np.flatnonzero(reached[:, -1] < window[1]):
+                    gaps.setdefault(int(rows[k]), []).append((int(reached[k, -1]) + 1, window[1]))
+        return RowCoverage(y_start, np.concatenate(covered) if covered else np.zeros(0, dtype=np.int64), gaps)
+
+    def sweep_coverage(
+        self,
+        y_start: int,
+        y_end: int,
+        x_min: Optional[int] = None,
+        x_max: Optional[int] = None,
+        workers: Optional[int] = 1,
+    ) -> RowCoverage:
+        """`row_coverage` with the rows split into one shard per worker (`None` for one per core)."""
+        if workers == 1:
+            return self.row_coverage(y_start, y_end, x_min, x_max)
+        num_shards = workers or os.cpu_count() or 1
+        cuts = [y_start + k * (y_end - y_start) // num_shards for k in range(num_shards + 1)]
+        shards = [(y0, y1) for y0, y1 in zip(cuts, cuts[1:]) if y0 < y1]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(self.row_coverage, *zip(*[(y0, y1, x_min, x_max) for y0, y1 in shards])))
+        gaps = {y: row_gaps for part in parts for y, row_gaps in part.gaps.items()}
+        return RowCoverage(y_start, np.concatenate([part.covered for part in parts]), gaps)
+
+    def in_range(self, coord: Coord) -> bool:
+        return any(l1_dist(coord, sensor) <= D for sensor, D in self.sensors.items())
+
+    def boundary_diagonals(self) -> Dict[str, DefaultDict[int, List[Coord]]]:
+        """Sensors keyed by the diagonals just outside their range, in rotated coordinates u = x + y, v = x - y.
+
+        "u+" / "u-" map the intercept u of a sensor's upper / lower u diagonal to the sensors having it, and "v+" /
+        "v-" the same for v.
+        """
+        diagonals: Dict[str, DefaultDict[int, List[Coord]]] = {
+            key: defaultdict(list) for key in ("u+", "u-", "v+", "v-")
+        }
+        for (x, y), D in self.sensors.items():
+            diagonals["u+"][x + y + D + 1].append((x, y))
+            diagonals["u-"][x + y - D - 1].append((x, y))
+            diagonals["v+"][x - y + D + 1].append((x, y))
+            diagonals["v-"][x - y - D - 1].append((x, y))
+        return diagonals
+
+    def find_distress_beacon(self, max_xy: int) -> Optional[Coord]:
+        """An isolated point out of every sensor's range lies on a u diagonal and a v diagonal that are each shared by
+        the outer edges of two opposing sensors, so only those diagonals need intersecting."""
+        diagonals = self.boundary_diagonals()
+        u_gaps = diagonals["u+"].keys() & diagonals["u-"].keys()
+        v_gaps = diagonals["v+"].keys() & diagonals["v-"].keys()
+        for u in u_gaps:
+            for v in v_gaps:
+                coord = ((u + v) // 2, (u - v) // 2)
+                if (u + v) % 2 == 0 and all([0 <= c <= max_xy for c in coord]) and not self.in_range(coord):
+                    return coord
+        return None
+
+    def get_signal_tuning_freq(
+        self, max_xy: int, search: Literal["lines", "diagonals", "rows"] = "lines", workers: Optional[int] = 1
+    ) -> int:
+        if search == "rows":  # Every row of the search area, sharded over `workers`
+            gaps = self.sweep_coverage(0, max_xy + 1, 0, max_xy, workers=workers).gaps
+            for y, row_gaps in sorted(gaps.items()):
+                return 4000000 * row_gaps[0][0] + y
+            return 0
+        if search == "diagonals":
+            coord = self.find_distress_beacon(max_xy)
+            if coord is not None:
+                return 4000000 * coord[0] + coord[1]
+            # Not enclosed by opposing sensors, so it lies on the border of the search area; fall back to all lines
         valid_sensors = [
             sensor
             for sensor in self.sensors
@@ -86,12 +199,26 @@ class SensorGrid:
         return 0
 
 
-# Tests
-test_grid = SensorGrid(sensor_positions=open("inputs/day15_test.txt").read().split("\n"))
-assert test_grid.count_impossible_beacon_coords(y_pos=10) == 26
-assert test_grid.get_signal_tuning_freq(20) == 56000011
-
-
-grid = SensorGrid(sensor_positions=open("inputs/day15.txt").read().split("\n"))
-print("Part 1: ", grid.count_impossible_beacon_coords(y_pos=2000000))
-print("Part 2: ", grid.get_signal_tuning_freq(4000000))
+PARTS = {
+    1: lambda path: SensorGrid(open(path).read().split("\n")).count_impossible_beacon_coords(y_pos=2000000),
+    2: lambda path: SensorGrid(open(path).read().split("\n")).get_signal_tuning_freq(4000000, search="diagonals"),
+}
+
+
+if __name__ == "__main__":
+    # Tests
+    test_grid = SensorGrid(sensor_positions=open(input_path(15, test=True)).read().split("\n"))
+    assert test_grid.count_impossible_beacon_coords(y_pos=10) == 26
+    assert test_grid.get_signal_tuning_freq(20) == 56000011
+    assert test_grid.get_signal_tuning_freq(20, search="diagonals") == 56000011
+    assert test_grid.get_signal_tuning_freq(20, search="rows", workers=2) == 56000011
+    test_coverage = test_grid.row_coverage(-10, 40)
+    assert all(
+        test_coverage.covered[y + 10] - len(test_grid.beacons[y]) == test_grid.count_impossible_beacon_coords(y)
+        for y in range(-10, 40)
+    )
+    assert test_grid.sweep_coverage(0, 21, 0, 20, workers=3).gaps == {11: [(14, 14)]}
+
+    grid = SensorGrid(sensor_positions=open(input_path(15)).read().split("\n"))
+    print("Part 1: ", grid.count_impossible_beacon_coords(y_pos=2000000))
+    print("Part 2: ", grid.get_signal_tuning_freq(4000000, search="diagonals"))
@@ -1,9 +1,15 @@
-from typing import Dict, List, Set, Tuple
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
+from solutions import input_path
+from solutions.chunks import map_byte_ranges
 
-def load_strategy_guide() -> List[str]:
+
+def load_strategy_guide(path: Path = input_path(2)) -> List[str]:
     res = []
-    with open("inputs/day2.txt", "r") as handle:
+    with open(path, "r") as handle:
         for line in handle.readlines():
             res.append(line.strip())
     return res
@@ -19,8 +25,8 @@ def round_score(match_round: str) -> int:
     return 6 * ((me, elf) in WIN_D) + 3 * (me == elf) + me
 
 
-def get_my_total() -> int:
-    match_rounds = load_strategy_guide()
+def get_my_total(path: Path = input_path(2)) -> int:
+    match_rounds = load_strategy_guide(path)
     return sum([round_score(match) for match in match_rounds])
 
 
@@ -35,10 +41,65 @@ def alter_round(match_round: str) -> str:
     return f"{elf} {ACTION_D[me][elf]}"
 
 
-def get_my_total_pt2() -> int:
-    altered_rounds = [alter_round(round) for round in load_strategy_guide()]
+def get_my_total_pt2(path: Path = input_path(2)) -> int:
+    altered_rounds = [alter_round(round) for round in load_strategy_guide(path)]
     return sum([round_score(match) for match in altered_rounds])
 
 
-print("Part 1: ", get_my_total())
-print("Part 2: ", get_my_total_pt2())
+# Histogram engine: only nine rounds exist, so count them and score each once
+ROUNDS = [f"{elf} {me}" for elf in "ABC" for me in "XYZ"]
+ROUND_SCORES: Dict[int, Dict[str, int]] = {
+    1: {match: round_score(match) for match in ROUNDS},
+    2: {match: round_score(alter_round(match)) for match in ROUNDS},
+}
+
+
+def count_in(data: bytes, counts: Counter) -> None:
+    counts.update({match: data.count(match.encode()) for match in ROUNDS})
+
+
+def count_rounds(path: Path, start: int = 0, end: Optional[int] = None, chunk_size: int = 1 << 20) -> Counter:
+    """Occurrences of every round between byte offsets `start` and `end`, counted on raw bytes chunk by chunk."""
+    remaining = (os.path.getsize(path) if end is None else end) - start
+    counts: Counter = Counter()
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        carry = b""
+        while remaining > 0 and (chunk := handle.read(min(chunk_size, remaining))):
+            remaining -= len(chunk)
+            complete, _, carry = (carry + chunk).rpartition(b"\n")  # A cut off round is counted with the next chunk
+            count_in(complete, counts)
+        count_in(carry, counts)
+    return counts
+
+
+def round_counts(path: Path = input_path(2), workers: Optional[int] = 1) -> Counter:
+    """Round histogram of the whole guide.
+
+    With several workers (`None` for one per core) the file is cut at newlines and the chunk histograms, counted in a
+    process pool, are added up.
+    """
+    if workers == 1:
+        return count_rounds(path)
+    return sum(map_byte_ranges(count_rounds, path, workers), Counter())
+
+
+def histogram_total(counts: Counter, part: int) -> int:
+    return sum(ROUND_SCORES[part][match] * count for match, count in counts.items())
+
+
+PARTS = {
+    1: lambda path: histogram_total(round_counts(path), 1),
+    2: lambda path: histogram_total(round_counts(path), 2),
+}
+
+
+if __name__ == "__main__":
+    # Tests
+    counts = round_counts()
+    assert counts == count_rounds(input_path(2), chunk_size=5) == round_counts(workers=3)
+    assert sum(counts.values()) == len(load_strategy_guide())
+    assert histogram_total(counts, 1) == get_my_total() and histogram_total(counts, 2) == get_my_total_pt2()
+
+    print("Part 1: ", histogram_total(counts, 1))
+    print("Part 2: ", histogram_total(counts, 2))
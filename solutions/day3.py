@@ -1,27 +1,93 @@
+import string
 from functools import reduce
-from typing import List, Tuple
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Tuple
 
+import numpy as np
 
-def get_input() -> List[Tuple[str, int]]:
-    return [(line, len(line) // 2) for line in open("inputs/day3.txt").read().split("\n")]
+from solutions import input_path
+
+PRIORITY_TABLE = bytes.maketrans(string.ascii_letters.encode(), bytes(range(1, 53)))  # Item byte -> priority byte
+
+
+def get_input(path: Path = input_path(3)) -> List[Tuple[str, int]]:
+    return [(line, len(line) // 2) for line in open(path).read().split("\n")]
 
 
 def get_priority(item: str) -> int:
     return ord(item.lower()) - ord("a") + 26 * item.isupper() + 1
 
 
-def get_part_1() -> int:
-    load_outs = get_input()
+def get_part_1(path: Path = input_path(3)) -> int:
+    load_outs = get_input(path)
     return sum(
         get_priority((set(pack[0][: pack[1]]).intersection(set(pack[0][pack[1] :]))).pop()) for pack in load_outs
     )
 
 
-def get_part_2() -> int:
-    load_outs = get_input()
+def get_part_2(path: Path = input_path(3)) -> int:
+    load_outs = get_input(path)
     elf_loads = [[elf[0] for elf in load_outs[k : k + 3]] for k in range(0, len(load_outs), 3)]
     return sum(get_priority(reduce(set.intersection, [set(elf) for elf in elf_load]).pop()) for elf_load in elf_loads)
 
 
-print("Part 1: ", get_part_1())
-print("Part 2: ", get_part_2())
+def rucksack_mask(items: bytes) -> int:
+    """Item types as a 52-bit set, bit `p` standing for the item of priority `p`."""
+    mask = 0
+    for priority in items.translate(PRIORITY_TABLE):
+        mask |= 1 << priority
+    return mask
+
+
+def mask_priority(mask: int) -> int:
+    return mask.bit_length() - 1
+
+
+def read_priority_batches(path: Path, batch_lines: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Item priorities of `batch_lines` rucksacks at a time, concatenated, along with every rucksack's length."""
+    with open(path, "rb") as handle:
+        while batch := [line for line in map(bytes.strip, islice(handle, batch_lines)) if line]:
+            priorities = np.frombuffer(b"".join(batch).translate(PRIORITY_TABLE), dtype=np.uint8)
+            yield priorities, np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+
+
+def segment_masks(priorities: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Masks of the items in each segment of `priorities`, the segments being non-empty and starting at `starts`."""
+    return np.bitwise_or.reduceat(np.left_shift(np.uint64(1), priorities.astype(np.uint64)), starts)
+
+
+def masks_priority(masks: np.ndarray) -> np.ndarray:
+    return np.frexp(masks.astype(np.float64))[1] - 1  # Exact bit_length - 1, as the masks are powers of two
+
+
+def compartment_priority_sum(path: Path = input_path(3), batch_lines: int = 1 << 16) -> int:
+    total = 0
+    for priorities, lengths in read_priority_batches(path, batch_lines):
+        starts = np.cumsum(lengths) - lengths
+        masks = segment_masks(priorities, np.column_stack([starts, starts + lengths // 2]).ravel())
+        total += int(masks_priority(masks[0::2] & masks[1::2]).sum())
+    return total
+
+
+def badge_priority_sum(path: Path = input_path(3), batch_lines: int = 3 << 16) -> int:
+    """Sum of the group badges, `batch_lines` being a multiple of three so that no group spans two batches."""
+    total = 0
+    for priorities, lengths in read_priority_batches(path, batch_lines):
+        masks = segment_masks(priorities, np.cumsum(lengths) - lengths)
+        total += int(masks_priority(np.bitwise_and.reduce(masks.reshape(-1, 3), axis=1)).sum())
+    return total
+
+
+PARTS = {1: compartment_priority_sum, 2: badge_priority_sum}
+
+
+if __name__ == "__main__":
+    # Tests
+    assert mask_priority(rucksack_mask(b"vJrwpWtwJgWr") & rucksack_mask(b"hcsFMMfFFhFp")) == 16
+    assert mask_priority(rucksack_mask(b"PmmdzqPrV") & rucksack_mask(b"vPwwTWBwg")) == 42
+    assert compartment_priority_sum(batch_lines=7) == get_part_1()
+    assert badge_priority_sum(batch_lines=6) == get_part_2()
+
+    print("Part 1: ", compartment_priority_sum())
+    print("Part 2: ", badge_priority_sum())
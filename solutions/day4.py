@@ -1,23 +1,131 @@
-from typing import List
+from pathlib import Path
+from typing import Iterator, List, Literal, Optional, Tuple, TypeAlias
 
+import numpy as np
 
-def load_data() -> List[List[int]]:
-    lines = open("inputs/day4.txt").read().split("\n")
+from solutions import input_path
+
+IntervalQuery: TypeAlias = Literal["overlapping", "containing", "contained_in"]
+
+SEPARATORS = str.maketrans("-,", "  ")
+
+
+def load_data(path: Path = input_path(4)) -> List[List[int]]:
+    lines = open(path).read().split("\n")
     return [[int(l) for l in line.split(",")[0].split("-") + line.split(",")[1].split("-")] for line in lines]
 
 
-def part_1() -> int:
-    elf_ranges = load_data()
+def part_1(path: Path = input_path(4)) -> int:
+    elf_ranges = load_data(path)
     return sum(
         any([(rng[0] <= rng[-2]) * (rng[-1] <= rng[1]), (rng[-2] <= rng[0]) * (rng[1] <= rng[-1])])
         for rng in elf_ranges
     )
 
 
-def part_2() -> int:
-    elf_ranges = load_data()
+def part_2(path: Path = input_path(4)) -> int:
+    elf_ranges = load_data(path)
     return sum(any([rng[0] <= rng[-2] <= rng[1], rng[-2] <= rng[0] <= rng[-1]]) for rng in elf_ranges)
 
 
-print("Part 1: ", part_1())
-print("Part 2: ", part_2())
+def load_sections(path: Path = input_path(4)) -> np.ndarray:
+    """All pairs as rows of (start_1, end_1, start_2, end_2), parsed in one pass over the text."""
+    sections = np.fromstring(open(path).read().translate(SEPARATORS), dtype=np.int64, sep=" ")
+    if sections.size % 4:
+        raise ValueError(f"{path} does not hold four section ids per pair")
+    return sections.reshape(-1, 4)
+
+
+def count_containing_pairs(sections: np.ndarray) -> int:
+    a, b, c, d = sections.T
+    return int(np.count_nonzero(((a <= c) & (d <= b)) | ((c <= a) & (b <= d))))
+
+
+def count_overlapping_pairs(sections: np.ndarray) -> int:
+    a, b, c, d = sections.T
+    return int(np.count_nonzero((a <= d) & (c <= b)))
+
+
+class AssignmentIndex:
+    """Section assignments indexed for range queries, assignment `2k + j` being elf `j` of pair `k`.
+
+    Assignments are ordered by start, and a merge sort tree keeps, for every aligned block of that order, the block
+    sorted by end. Any query below asks for a prefix or suffix of the start order whose ends pass a threshold: the
+    range splits into O(log n) blocks, each answered by a binary search, so counting takes O(log^2 n) and finding
+    adds the number of matches.
+    """
+
+    def __init__(self, sections: np.ndarray) -> None:
+        assignments = sections.reshape(-1, 2)
+        order = np.argsort(assignments[:, 0], kind="stable")
+        self.starts = assignments[order, 0]
+        self.block_ends: List[np.ndarray] = [assignments[order, 1]]
+        self.block_ids: List[np.ndarray] = [order]
+        end_offset = self.block_ends[0] - self.block_ends[0].min() if len(order) else self.block_ends[0]
+        size, span = 1, int(end_offset.max(initial=0)) + 1
+        while size < len(order):
+            size *= 2
+            # Each block joins two halves already sorted by end, which the stable (merging) sort picks up on
+            sort_ix = np.argsort(np.arange(len(order)) // size * span + end_offset, kind="stable")
+            end_offset = end_offset[sort_ix]
+            self.block_ends.append(self.block_ends[-1][sort_ix])
+            self.block_ids.append(self.block_ids[-1][sort_ix])
+
+    def blocks(self, lo: int, hi: int) -> Iterator[Tuple[int, int, int]]:
+        """Split positions [lo, hi) of the start order into aligned blocks, as (level, block start, block end)."""
+        while lo < hi:
+            level = 0
+            while level + 1 < len(self.block_ends) and lo % (2 << level) == 0 and lo + (2 << level) <= hi:
+                level += 1
+            yield level, lo, lo + (1 << level)
+            lo += 1 << level
+
+    def matching_runs(self, kind: IntervalQuery, start: int, end: int) -> Iterator[Tuple[np.ndarray, int, int]]:
+        """Per block, the ids array of its level and the run of positions in it that match the query."""
+        min_end: Optional[int] = None
+        max_end: Optional[int] = None
+        match kind:
+            case "overlapping":  # Starting no later than `end`, ending no earlier than `start`
+                lo, hi = 0, int(np.searchsorted(self.starts, end, side="right"))
+                min_end = start
+            case "containing":
+                lo, hi = 0, int(np.searchsorted(self.starts, start, side="right"))
+                min_end = end
+            case "contained_in":
+                lo, hi = int(np.searchsorted(self.starts, start, side="left")), len(self.starts)
+                max_end = end
+        for level, block_start, block_end in self.blocks(lo, hi):
+            ends = self.block_ends[level][block_start:block_end]
+            first = 0 if min_end is None else int(np.searchsorted(ends, min_end, side="left"))
+            last = len(ends) if max_end is None else int(np.searchsorted(ends, max_end, side="right"))
+            yield self.block_ids[level], block_start + first, block_start + last
+
+    def count(self, kind: IntervalQuery, start: int, end: int) -> int:
+        return sum(last - first for _, first, last in self.matching_runs(kind, start, end))
+
+    def find(self, kind: IntervalQuery, start: int, end: int) -> np.ndarray:
+        """Ids of the assignments overlapping, containing, or contained in sections `start` to `end`, ascending."""
+        runs = [ids[first:last] for ids, first, last in self.matching_runs(kind, start, end)]
+        return np.sort(np.concatenate(runs)) if runs else np.empty(0, dtype=np.int64)
+
+
+PARTS = {
+    1: lambda path: count_containing_pairs(load_sections(path)),
+    2: lambda path: count_overlapping_pairs(load_sections(path)),
+}
+
+
+if __name__ == "__main__":
+    # Tests
+    sections = load_sections()
+    assert count_containing_pairs(sections) == part_1() and count_overlapping_pairs(sections) == part_2()
+    index, assignments = AssignmentIndex(sections), sections.reshape(-1, 2)
+    for lo, hi in [(1, 1), (5, 17), (40, 60), (90, 99), (0, 200), (150, 200)]:
+        s, e = assignments.T
+        assert np.array_equal(index.find("overlapping", lo, hi), np.flatnonzero((s <= hi) & (e >= lo)))
+        assert np.array_equal(index.find("containing", lo, hi), np.flatnonzero((s <= lo) & (e >= hi)))
+        assert np.array_equal(index.find("contained_in", lo, hi), np.flatnonzero((s >= lo) & (e <= hi)))
+        assert index.count("overlapping", lo, hi) == np.count_nonzero((s <= hi) & (e >= lo))
+
+    print("Part 1: ", count_containing_pairs(sections))
+    print("Part 2: ", count_overlapping_pairs(sections))
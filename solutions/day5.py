@@ -1,14 +1,19 @@
-from typing import List, Literal, Tuple
+from pathlib import Path
+from typing import Iterable, Iterator, List, Literal, Tuple
 
+from solutions import input_path
 
-def load_data() -> Tuple[List[List[str]], List[List[int]]]:
+
+def load_data(path: Path = input_path(5)) -> Tuple[List[List[str]], List[List[int]]]:
     stacks_transposed, rearrangments = [], []
-    for line in open("inputs/day5.txt").read().split("\n"):
+    for line in open(path).read().split("\n"):
         if line.startswith("move"):
             rearrangments.append([int(x) for x in line.split() if x.isdigit()])
         elif "[" in line:
             stacks_transposed.append(list(line[1:][::4]))
-    stacks = [[row[k] for row in stacks_transposed if row[k] != " "] for k in range(9)]
+        elif line.strip():
+            num_stacks = len(line.split())
+    stacks = [[row[k] for row in stacks_transposed if k < len(row) and row[k] != " "] for k in range(num_stacks)]
     return stacks, rearrangments
 
 
@@ -16,8 +21,8 @@ def crane_op(crate_stack: List[str], amount: int, version: str) -> List[str]:
     return crate_stack[:amount] if version == "9001" else crate_stack[:amount][::-1]
 
 
-def restack(crane_version: Literal["9000", "9001"]) -> str:
-    stacks, rearrangements = load_data()
+def restack(crane_version: Literal["9000", "9001"], path: Path = input_path(5)) -> str:
+    stacks, rearrangements = load_data(path)
     "Operation(opx): [amount, from_ix + 1, to_ix + 1]"
     for opx in rearrangements:
         amt, from_ix, to_ix = opx[0], opx[1] - 1, opx[2] - 1
@@ -26,5 +31,49 @@ def restack(crane_version: Literal["9000", "9001"]) -> str:
     return "".join(stack[0] for stack in stacks)
 
 
-print("Part 1: ", restack(crane_version="9000"))
-print("Part 2: ", restack(crane_version="9001"))
+def read_stacks(lines: Iterator[str]) -> List[List[str]]:
+    """Consume the drawing up to its blank line, returning every stack bottom first so tops sit at the tail."""
+    rows = []
+    for line in lines:
+        if not line.strip():
+            break
+        rows.append(line.rstrip("\n"))
+    num_stacks = len(rows[-1].split())
+    stacks: List[List[str]] = [[] for _ in range(num_stacks)]
+    for row in reversed(rows[:-1]):
+        for k, crate in enumerate(row[1::4]):
+            if crate != " ":
+                stacks[k].append(crate)
+    return stacks
+
+
+def rearrange(crane_version: Literal["9000", "9001"], lines: Iterable[str]) -> str:
+    """Top crates after streaming through the moves, each costing O(amount) as crates leave from the tail."""
+    lines = iter(lines)
+    stacks = read_stacks(lines)
+    for line in lines:
+        if line.startswith("move"):
+            _, amount, _, from_no, _, to_no = line.split()
+            from_stack = stacks[int(from_no) - 1]
+            cut = len(from_stack) - int(amount)  # Not a negative index, so that moving 0 crates moves none
+            crates = from_stack[cut:]
+            del from_stack[cut:]
+            stacks[int(to_no) - 1].extend(crates if crane_version == "9001" else reversed(crates))
+    return "".join(stack[-1] for stack in stacks if stack)
+
+
+PARTS = {1: lambda path: rearrange("9000", open(path)), 2: lambda path: rearrange("9001", open(path))}
+
+
+if __name__ == "__main__":
+    # Tests
+    test_lines = ["    [D]    ", "[N] [C]    ", "[Z] [M] [P]", " 1   2   3 ", ""]
+    test_lines += ["move 1 from 2 to 1", "move 3 from 1 to 3", "move 2 from 2 to 1", "move 1 from 1 to 2"]
+    assert read_stacks(iter(test_lines)) == [["Z", "N"], ["M", "C", "D"], ["P"]]
+    assert rearrange("9000", test_lines) == "CMZ" and rearrange("9001", test_lines) == "MCD"
+    assert rearrange("9000", test_lines[:5] + ["move 0 from 2 to 1"]) == "NDP"
+    assert rearrange("9000", open(input_path(5))) == restack("9000")
+    assert rearrange("9001", open(input_path(5))) == restack("9001")
+
+    print("Part 1: ", rearrange("9000", open(input_path(5))))
+    print("Part 2: ", rearrange("9001", open(input_path(5))))
@@ -1,16 +1,74 @@
-def load_data() -> str:
-    return open("inputs/day6.txt").read().strip()
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
 
+from solutions import input_path
 
-def signal_decoder(packet_length: int) -> int:
+
+def load_data(path: Path = input_path(6)) -> str:
+    return open(path).read().strip()
+
+
+def signal_decoder(packet_length: int, path: Path = input_path(6)) -> int:
     """I know this is less efficient than using a stack, but I am a sucker for
     that sweet python list comprehension."""
-    signal_string = load_data()
+    signal_string = load_data(path)
     num_packet_chars = [
         len(set(signal_string[k - packet_length : k])) for k in range(packet_length, len(signal_string))
     ]
     return [k for k, length in enumerate(num_packet_chars) if length == packet_length][0] + packet_length
 
 
-print("Part 1: ", signal_decoder(4))
-print("Part 2: ", signal_decoder(14))
+def read_chunks(path: Path, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """The signal in chunks of bytes, ending at the first newline."""
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            signal, newline, _ = chunk.partition(b"\n")
+            yield signal
+            if newline:
+                return
+
+
+def find_markers(packet_lengths: Iterable[int], chunks: Iterable[bytes]) -> Dict[int, int]:
+    """Characters read up to the end of the first run of distinct characters of each length, in a single pass.
+
+    Instead of counting the characters in every window, remember where each byte value was last seen: the current
+    run of distinct characters starts just after the latest repeat, and grows by at most one per character, so a
+    length is first reached exactly when its marker ends. Stops reading once every length has been found.
+    """
+    pending = sorted(set(packet_lengths), reverse=True)
+    markers: Dict[int, int] = {}
+    last_seen, run_start, position = [-1] * 256, 0, 0
+    for chunk in chunks:
+        for char in chunk:
+            if last_seen[char] >= run_start:
+                run_start = last_seen[char] + 1
+            last_seen[char] = position
+            position += 1
+            if position - run_start == pending[-1]:
+                markers[pending.pop()] = position
+                if not pending:
+                    return markers
+    return markers
+
+
+def marker_position(packet_length: int, path: Path = input_path(6)) -> int:
+    return find_markers([packet_length], read_chunks(path))[packet_length]
+
+
+PARTS = {1: lambda path: marker_position(4, path), 2: lambda path: marker_position(14, path)}
+
+
+if __name__ == "__main__":
+    for signal, expected in [
+        ("mjqjpqmgbljsphdztnvjfqwrcgsmlb", {4: 7, 14: 19}),
+        ("nppdvjthqldpwncqszvftbrmjlhg", {4: 6, 14: 23}),
+    ]:
+        assert find_markers([4, 14], [signal[:5].encode(), signal[5:].encode()]) == expected
+    assert find_markers([4, 40], [b"abcd"]) == {4: 4}
+    assert find_markers([4, 14], read_chunks(input_path(6), chunk_size=7)) == {
+        4: signal_decoder(4),
+        14: signal_decoder(14),
+    }
+
+    print("Part 1: ", marker_position(4))
+    print("Part 2: ", marker_position(14))
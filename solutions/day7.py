@@ -1,6 +1,9 @@
 from collections import defaultdict
+from pathlib import Path
 from queue import PriorityQueue
-from typing import DefaultDict, Dict, List, Literal, NamedTuple, Optional, Set
+from typing import DefaultDict, Dict, Iterable, Iterator, List, Literal, NamedTuple, Optional, Set
+
+from solutions import input_path
 
 
 class FileSystemObject(NamedTuple):
@@ -59,31 +62,119 @@ def get_directory_sizes_bfs(terminal_list: List[str]) -> List[int]:
     return [directory_sizes[obj.path_str()] for obj in file_tree if obj.type == "dir"]
 
 
-def part1(terminal_list: List[str], graph_search: Literal["dfs", "bfs"] = "dfs") -> int:
-    match graph_search:
-        case "dfs":
-            return sum(val for val in get_directory_sizes_dfs(terminal_list) if val <= 100000)
-        case "bfs":
-            return sum(val for val in get_directory_sizes_bfs(terminal_list) if val <= 100000)
+class DirectoryTree:
+    """Directories as integer ids with parent and child arrays, fed terminal lines one at a time.
+
+    Names are interned to ids once, and every file adds its size to the totals of its directory and all ancestors
+    as it is listed, so directory sizes can be queried at any point of an ongoing transcript.
+    """
+
+    ROOT = 0
+
+    def __init__(self) -> None:
+        self.name_ids: Dict[str, int] = {}
+        self.parent: List[int] = [self.ROOT]
+        self.children: List[Dict[int, int]] = [{}]
+        self.files: List[Dict[int, int]] = [{}]
+        self.totals: List[int] = [0]
+        self.cwd = self.ROOT
+
+    @classmethod
+    def from_lines(cls, terminal_lines: Iterable[str]) -> "DirectoryTree":
+        tree = cls()
+        for line in terminal_lines:
+            tree.feed(line)
+        return tree
+
+    def intern(self, name: str) -> int:
+        return self.name_ids.setdefault(name, len(self.name_ids))
+
+    def subdirectory(self, directory: int, name: str) -> int:
+        name_id = self.intern(name)
+        child = self.children[directory].get(name_id)
+        if child is None:
+            child = self.children[directory][name_id] = len(self.parent)
+            self.parent.append(directory)
+            self.children.append({})
+            self.files.append({})
+            self.totals.append(0)
+        return child
+
+    def add_file(self, directory: int, name: str, size: int) -> None:
+        name_id = self.intern(name)
+        delta = size - self.files[directory].get(name_id, 0)  # Listing a directory twice must not count twice
+        self.files[directory][name_id] = size
+        while True:
+            self.totals[directory] += delta
+            if directory == self.ROOT:
+                break
+            directory = self.parent[directory]
+
+    def feed(self, line: str) -> None:
+        match line.split():
+            case ["$", "cd", ".."]:
+                self.cwd = self.parent[self.cwd]
+            case ["$", "cd", "/"]:
+                self.cwd = self.ROOT
+            case ["$", "cd", directory]:
+                self.cwd = self.subdirectory(self.cwd, directory)
+            case ["dir", directory]:
+                self.subdirectory(self.cwd, directory)
+            case [bytes, file] if bytes.isdigit():
+                self.add_file(self.cwd, file, int(bytes))
+
+    def directory_sizes(self) -> List[int]:
+        return self.totals
 
+    def total_at_most(self, max_size: int = 100000) -> int:
+        return sum(val for val in self.totals if val <= max_size)
 
-def part2(terminal_list: List[str], graph_search: Literal["dfs", "bfs"] = "dfs") -> int:
+    def smallest_to_free(self, disk_size: int = 70000000, space_needed: int = 30000000) -> int:
+        space_target = space_needed + self.totals[self.ROOT] - disk_size
+        return min(val for val in self.totals if val >= space_target)
+
+
+def get_directory_sizes(terminal_list: Iterable[str], graph_search: Literal["dfs", "bfs", "tree"]) -> List[int]:
     match graph_search:
         case "dfs":
-            dir_sizes = get_directory_sizes_dfs(terminal_list)
-            space_target = 30000000 + max(dir_sizes) - 70000000
-            return min(val for val in dir_sizes if val >= space_target)
+            return get_directory_sizes_dfs(list(terminal_list))
         case "bfs":
-            dir_sizes = get_directory_sizes_bfs(terminal_list)
-            space_target = 30000000 + max(dir_sizes) - 70000000
-            return min(val for val in dir_sizes if val >= space_target)
+            return get_directory_sizes_bfs(list(terminal_list))
+        case "tree":
+            return DirectoryTree.from_lines(terminal_list).directory_sizes()
+
+
+def part1(terminal_list: Iterable[str], graph_search: Literal["dfs", "bfs", "tree"] = "dfs") -> int:
+    return sum(val for val in get_directory_sizes(terminal_list, graph_search) if val <= 100000)
+
+
+def part2(terminal_list: Iterable[str], graph_search: Literal["dfs", "bfs", "tree"] = "dfs") -> int:
+    dir_sizes = get_directory_sizes(terminal_list, graph_search)
+    space_target = 30000000 + max(dir_sizes) - 70000000
+    return min(val for val in dir_sizes if val >= space_target)
+
+
+def stream_lines(path: Path) -> Iterator[str]:
+    with open(path) as file:
+        yield from file
+
+
+PARTS = {
+    1: lambda path: DirectoryTree.from_lines(stream_lines(path)).total_at_most(),
+    2: lambda path: DirectoryTree.from_lines(stream_lines(path)).smallest_to_free(),
+}
 
 
-test_case = open("inputs/day7_test.txt").read().split("\n")
-assert part1(test_case) == 95437
-assert part1(test_case, "dfs") == part1(test_case, "bfs")
-assert part2(test_case) == 24933642
-assert part2(test_case, "dfs") == part2(test_case, "bfs")
+if __name__ == "__main__":
+    test_case = open(input_path(7, test=True)).read().split("\n")
+    assert part1(test_case) == 95437
+    assert part1(test_case, "dfs") == part1(test_case, "bfs")
+    assert part2(test_case) == 24933642
+    assert part2(test_case, "dfs") == part2(test_case, "bfs")
+    assert part1(test_case, "tree") == 95437 and part2(test_case, "tree") == 24933642
+    assert DirectoryTree.from_lines(test_case + test_case).directory_sizes() == [48381165, 94853, 24933642, 584]
 
-print("Part 1: ", part1(open("inputs/day7.txt").read().split("\n")))
-print("Part 2: ", part2(open("inputs/day7.txt").read().split("\n")))
+    tree = DirectoryTree.from_lines(stream_lines(input_path(7)))
+    assert sorted(tree.directory_sizes()) == sorted(get_directory_sizes_dfs(open(input_path(7)).read().split("\n")))
+    print("Part 1: ", tree.total_at_most())
+    print("Part 2: ", tree.smallest_to_free())
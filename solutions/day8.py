@@ -1,5 +1,10 @@
 from collections import defaultdict
-from typing import DefaultDict, Dict, List, Set, Tuple
+from pathlib import Path
+from typing import Callable, DefaultDict, Dict, Iterator, List, Set, Tuple
+
+import numpy as np
+
+from solutions import input_path
 
 
 def generate_lr_max_dicts(tree_line: str) -> Tuple[DefaultDict, DefaultDict]:
@@ -75,12 +80,79 @@ def get_max_scenic_score(tree_line_rows: List[str]) -> int:
     return max(scores)
 
 
-# Tests
-tree_lines_test = open("inputs/day8_test.txt").read().split("\n")
-tree_cols_test = list("".join(t) for t in zip(*tree_lines_test))
-assert get_visible_trees(tree_lines_test[2]) == [0, 1, 3, 4]
-assert len(get_visible_tree_positions(tree_lines_test)) == 21
-assert get_max_scenic_score(tree_lines_test) == 8
+def load_forest(path: Path = input_path(8)) -> np.ndarray:
+    rows = open(path, "rb").read().split()
+    return (np.frombuffer(b"".join(rows), dtype=np.uint8) - ord("0")).reshape(len(rows), -1)
+
+
+def from_each_side(look_from_left: Callable[[np.ndarray], np.ndarray], heights: np.ndarray) -> Iterator[np.ndarray]:
+    """Apply a left-to-right scan to the forest seen from all four sides, each result in the forest's orientation."""
+    yield look_from_left(heights)
+    yield np.flip(look_from_left(np.flip(heights, 1)), 1)
+    yield look_from_left(heights.T).T
+    yield np.flip(look_from_left(np.flip(heights.T, 1)), 1).T
+
+
+def visible_from_left(heights: np.ndarray) -> np.ndarray:
+    tallest_before = np.full(heights.shape, -1, dtype=np.int8)
+    tallest_before[:, 1:] = np.maximum.accumulate(heights, axis=1)[:, :-1]
+    return heights > tallest_before
+
+
+def view_distances_from_left(heights: np.ndarray) -> np.ndarray:
+    """How far each tree sees to its left, sweeping all rows at once column by column.
+
+    With only ten heights, the monotonic stack of a row collapses to the last column each height was seen in; the
+    view ends at the latest of those for heights at least as tall, or at the edge in column 0.
+    """
+    columns = np.ascontiguousarray(heights.T)  # Sweeping reads and writes whole columns, keep them contiguous
+    cols, rows = columns.shape
+    row_ix = np.arange(rows)
+    last_seen = np.zeros((10, rows), dtype=np.int32)
+    distances = np.empty((cols, rows), dtype=np.int32)
+    for col, column in enumerate(columns):
+        blocker = np.maximum.accumulate(last_seen[::-1], axis=0)[::-1]
+        distances[col] = col - blocker[column, row_ix]
+        last_seen[column, row_ix] = col
+    return distances.T
+
+
+def visibility_mask(heights: np.ndarray) -> np.ndarray:
+    visible = np.zeros(heights.shape, dtype=bool)
+    for visible_from_side in from_each_side(visible_from_left, heights):
+        visible |= visible_from_side
+    return visible
+
+
+def scenic_scores(heights: np.ndarray) -> np.ndarray:
+    scores = np.ones(heights.shape, dtype=np.int64)
+    for distances in from_each_side(view_distances_from_left, heights):
+        scores *= distances
+    return scores
+
+
+PARTS = {
+    1: lambda path: int(np.count_nonzero(visibility_mask(load_forest(path)))),
+    2: lambda path: int(scenic_scores(load_forest(path)).max()),
+}
+
+
+if __name__ == "__main__":
+    # Tests
+    tree_lines_test = open(input_path(8, test=True)).read().split("\n")
+    tree_cols_test = list("".join(t) for t in zip(*tree_lines_test))
+    assert get_visible_trees(tree_lines_test[2]) == [0, 1, 3, 4]
+    assert len(get_visible_tree_positions(tree_lines_test)) == 21
+    assert get_max_scenic_score(tree_lines_test) == 8
+    forest_test = load_forest(input_path(8, test=True))
+    assert {tuple(pos) for pos in np.argwhere(visibility_mask(forest_test))} == get_visible_tree_positions(
+        tree_lines_test
+    )
+    assert scenic_scores(forest_test)[3, 2] == 8 and scenic_scores(forest_test).max() == 8
 
-print("Part 1: ", len(get_visible_tree_positions(open("inputs/day8.txt").read().split("\n"))))
-print("Part 2: ", get_max_scenic_score(open("inputs/day8.txt").read().split("\n")))
+    forest = load_forest()
+    assert np.count_nonzero(visibility_mask(forest)) == len(
+        get_visible_tree_positions(open(input_path(8)).read().split())
+    )
+    print("Part 1: ", np.count_nonzero(visibility_mask(forest)))
+    print("Part 2: ", scenic_scores(forest).max())
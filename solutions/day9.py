@@ -1,7 +1,15 @@
-from typing import List, Set, Tuple, TypeAlias
+from typing import Iterator, List, Literal, Set, Tuple, TypeAlias
+
+import numpy as np
+
+from solutions import input_path
+from solutions.grid import Coord
 
-Coord: TypeAlias = Tuple[int, int]  # Coordinate class
 CoordUpdate: TypeAlias = int
+Path2D: TypeAlias = Tuple[List[int], List[int]]  # x and y positions a knot moves through, in order
+
+DIRECTIONS = {"R": (1, 0), "L": (-1, 0), "U": (0, 1), "D": (0, -1)}
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
 
 
 def signum(i: int) -> int:
@@ -50,12 +58,109 @@ def simulate_motion(head_motions: List[str], num_knots: int = 2) -> Set[Coord]:
     return tail_seen
 
 
-# Tests
-test_motions = open("inputs/day9_test.txt").read().split("\n\n")
-print(len(simulate_motion(test_motions[0].split("\n"))))
-assert len(simulate_motion(test_motions[0].split("\n"))) == 13
-assert len(simulate_motion(test_motions[1].split("\n"), num_knots=10)) == 36
-
-motions = open("inputs/day9.txt").read().split("\n")
-print("Part 1: ", len(simulate_motion(motions)))
-print("Part 2: ", len(simulate_motion(motions, num_knots=10)))
+def parse_motions(head_motions: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unit x and y updates and step counts, one entry per motion."""
+    motions = [motion.split() for motion in head_motions if motion.strip()]
+    units = np.array([DIRECTIONS[direction] for direction, _ in motions], dtype=np.int64).reshape(-1, 2)
+    steps = np.array([int(steps) for _, steps in motions], dtype=np.int64)
+    return units[:, 0], units[:, 1], steps
+
+
+def follow(leader: Path2D, start: Coord) -> Path2D:
+    """Positions a knot starting at `start` moves through while its leader moves through `leader`.
+
+    Only actual moves are recorded, so a knot that stays put yields a path of its start alone.
+    """
+    tx, ty = start
+    xs, ys = [tx], [ty]
+    for hx, hy in zip(*leader):
+        dx, dy = hx - tx, hy - ty
+        if -1 <= dx <= 1 and -1 <= dy <= 1:
+            continue
+        tx, ty = tx + (dx > 0) - (dx < 0), ty + (dy > 0) - (dy < 0)
+        xs.append(tx)
+        ys.append(ty)
+    return xs, ys
+
+
+def head_path_chunks(
+    unit_x: np.ndarray, unit_y: np.ndarray, steps: np.ndarray, chunk_motions: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Every unit step of the head as x and y arrays, `chunk_motions` motions at a time."""
+    head_x, head_y = 0, 0
+    for k in range(0, len(steps), chunk_motions):
+        chunk = slice(k, k + chunk_motions)
+        xs = head_x + np.cumsum(np.repeat(unit_x[chunk], steps[chunk]))
+        ys = head_y + np.cumsum(np.repeat(unit_y[chunk], steps[chunk]))
+        if len(xs):
+            head_x, head_y = int(xs[-1]), int(ys[-1])
+            yield xs, ys
+
+
+def mark_cells(bitmap: np.ndarray, cells: np.ndarray) -> None:
+    """Set the bits of `cells` in the packed `bitmap`, cell c being bit c & 7 of byte c >> 3.
+
+    A fancy-indexed `|=` keeps only one write per repeated byte, so the bits are first OR-ed together per byte.
+    """
+    cells = np.unique(cells)
+    byte_ix = cells >> 3
+    starts = np.flatnonzero(np.concatenate([[True], byte_ix[1:] != byte_ix[:-1]]))
+    bitmap[byte_ix[starts]] |= np.bitwise_or.reduceat((1 << (cells & 7)).astype(np.uint8), starts)
+
+
+def simulate_motion_array(head_motions: List[str], num_knots: int = 2, chunk_motions: int = 1 << 16) -> int:
+    """Number of cells the tail visits, following the whole rope one knot at a time rather than one step at a time.
+
+    Each knot follows its leader's full path for a chunk of motions and hands on only the positions it actually
+    moved through, so once some knot stands still for a chunk no knot behind it needs to be looked at. Knots never
+    leave the head's bounding box, which sizes the bitmap of visited tail cells, packed eight cells to a byte.
+    """
+    unit_x, unit_y, steps = parse_motions(head_motions)
+    ends_x = np.concatenate([[0], np.cumsum(unit_x * steps)])  # Straight motions reach their extremes at the ends
+    ends_y = np.concatenate([[0], np.cumsum(unit_y * steps)])
+    x_min, y_min = int(ends_x.min()), int(ends_y.min())
+    row_bytes = (int(ends_x.max()) - x_min) // 8 + 1
+    visited = np.zeros((int(ends_y.max()) - y_min + 1) * row_bytes, dtype=np.uint8)
+    mark_cells(visited, np.array([-y_min * 8 * row_bytes - x_min]))
+    knots: List[Coord] = [(0, 0)] * num_knots
+    for head_xs, head_ys in head_path_chunks(unit_x, unit_y, steps, chunk_motions):
+        leader: Path2D = (head_xs.tolist(), head_ys.tolist())
+        knots[0] = (leader[0][-1], leader[1][-1])
+        for k in range(1, num_knots):
+            leader = follow(leader, knots[k])
+            knots[k] = (leader[0][-1], leader[1][-1])
+            if len(leader[0]) == 1:
+                break
+        else:
+            mark_cells(visited, (np.array(leader[1]) - y_min) * 8 * row_bytes + np.array(leader[0]) - x_min)
+    return int(POPCOUNT[visited].sum(dtype=np.int64))
+
+
+def count_tail_cells(head_motions: List[str], num_knots: int = 2, engine: Literal["tuple", "array"] = "tuple") -> int:
+    match engine:
+        case "tuple":
+            return len(simulate_motion(head_motions, num_knots=num_knots))
+        case "array":
+            return simulate_motion_array(head_motions, num_knots=num_knots)
+
+
+PARTS = {
+    1: lambda path: count_tail_cells(open(path).read().split("\n"), engine="array"),
+    2: lambda path: count_tail_cells(open(path).read().split("\n"), num_knots=10, engine="array"),
+}
+
+
+if __name__ == "__main__":
+    # Tests
+    test_motions = open(input_path(9, test=True)).read().split("\n\n")
+    assert len(simulate_motion(test_motions[0].split("\n"))) == 13
+    assert len(simulate_motion(test_motions[1].split("\n"), num_knots=10)) == 36
+    assert count_tail_cells(test_motions[0].split("\n"), engine="array") == 13
+    assert count_tail_cells(test_motions[1].split("\n"), num_knots=10, engine="array") == 36
+    assert simulate_motion_array(test_motions[1].split("\n"), num_knots=10, chunk_motions=3) == 36
+    assert simulate_motion_array(test_motions[1].split("\n"), num_knots=1000) == 1
+
+    motions = open(input_path(9)).read().split("\n")
+    assert count_tail_cells(motions, num_knots=10) == count_tail_cells(motions, num_knots=10, engine="array")
+    print("Part 1: ", count_tail_cells(motions, engine="array"))
+    print("Part 2: ", count_tail_cells(motions, num_knots=10, engine="array"))
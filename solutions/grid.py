@@ -0,0 +1,91 @@
+"""Compact grids and coordinate helpers shared by the grid based days (days 12 and 14 store their grids here).
+
+`DenseGrid` stores a bounded rectangle of cells in a flat `array` (a byte or an int32 per cell) with an offset
+origin, cell (x, y) living at `(y - y0) * width + x - x0`, so hot loops can work on plain integer indices.
+`SparseGrid` is the unbounded fallback: a dict keyed by coordinates packed into a single int rather than tuples.
+"""
+from array import array
+from typing import Dict, List, Optional, Tuple, TypeAlias
+
+import numpy as np
+
+Coord: TypeAlias = Tuple[int, int]
+
+PACK_BITS = 32
+PACK_BIAS = 1 << (PACK_BITS - 1)  # Packed coordinates must lie in [-PACK_BIAS, PACK_BIAS)
+PACK_MASK = (1 << PACK_BITS) - 1
+
+
+def l1_dist(c1: Coord, c2: Coord) -> int:
+    return abs(c1[0] - c2[0]) + abs(c1[1] - c2[1])
+
+
+def pack(x: int, y: int) -> int:
+    return (y + PACK_BIAS) << PACK_BITS | (x + PACK_BIAS)
+
+
+class DenseGrid:
+    """A `width` x `height` rectangle of cells with its top left corner at (x0, y0), stored row-major.
+
+    `typecode` is an `array` typecode, "B" for byte cells and "i" for int32 ones; `cells` adopts existing storage
+    instead of filling a new array with `fill`.
+    """
+
+    def __init__(
+        self,
+        x0: int,
+        y0: int,
+        width: int,
+        height: int,
+        typecode: str = "B",
+        fill: int = 0,
+        cells: Optional[array] = None,
+    ):
+        self.x0, self.y0, self.width, self.height = x0, y0, width, height
+        self.cells = array(typecode, [fill]) * (width * height) if cells is None else cells
+
+    @classmethod
+    def from_rows(cls, rows: List[bytes], x0: int = 0, y0: int = 0) -> "DenseGrid":
+        """Byte cells holding the bytes of equally long `rows`, the first row being row `y0`."""
+        return cls(x0, y0, len(rows[0]), len(rows), cells=array("B", b"".join(rows)))
+
+    def index(self, x: int, y: int) -> int:
+        return (y - self.y0) * self.width + x - self.x0
+
+    def coord(self, index: int) -> Coord:
+        y, x = divmod(index, self.width)
+        return x + self.x0, y + self.y0
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x - self.x0 < self.width and 0 <= y - self.y0 < self.height
+
+    def get(self, x: int, y: int, default: int = 0) -> int:
+        return self.cells[self.index(x, y)] if self.in_bounds(x, y) else default
+
+    def set(self, x: int, y: int, value: int) -> None:
+        self.cells[self.index(x, y)] = value
+
+    def fill_line(self, start: Coord, end: Coord, value: int) -> None:
+        """Set every cell of the horizontal or vertical segment from `start` to `end`, both included."""
+        (x1, y1), (x2, y2) = start, end
+        first, length = self.index(min(x1, x2), min(y1, y2)), 1 + abs(x2 - x1) + abs(y2 - y1)
+        step = self.width if x1 == x2 else 1
+        self.cells[first : first + step * length : step] = array(self.cells.typecode, [value]) * length
+
+    def find_all(self, value: int) -> List[int]:
+        """Indices of the cells holding `value`, in order."""
+        return np.flatnonzero(np.frombuffer(self.cells, dtype=self.cells.typecode) == value).tolist()
+
+
+class SparseGrid:
+    """Cells of an unbounded grid in a dict keyed by `pack`ed coordinates, cells never set reading as `default`."""
+
+    def __init__(self, default: int = 0):
+        self.cells: Dict[int, int] = {}
+        self.default = default
+
+    def get(self, x: int, y: int) -> int:
+        return self.cells.get(pack(x, y), self.default)
+
+    def set(self, x: int, y: int, value: int) -> None:
+        self.cells[pack(x, y)] = value
@@ -0,0 +1,88 @@
+"""Opt-in instrumentation that solutions report their hot loops into.
+
+Solutions count inner-loop events in local integers and report each total once per call with `count`, and can time
+sections with `span`.  Both do nothing but check a module global unless a `recording` is active, so instrumented
+code runs at full speed when nobody is listening.  A recording also measures the wall time and `tracemalloc` peak of
+the block it wraps, and its `Report` is plain data that exports to JSON.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Report:
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+        self.counters: Dict[str, int] = {}
+        self.spans: Dict[str, Dict[str, float]] = {}  # Name -> calls and total seconds
+        self.carried_peak = 0  # Traced peak from before a nested recording reset it
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"seconds": self.seconds, "peak_bytes": self.peak_bytes, "counters": self.counters, "spans": self.spans}
+
+
+_report: Optional[Report] = None
+
+
+def enabled() -> bool:
+    """Whether a recording is listening, for reports that cost something to compute."""
+    return _report is not None
+
+
+def count(name: str, amount: int = 1) -> None:
+    if _report is not None:
+        _report.counters[name] = _report.counters.get(name, 0) + amount
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    if _report is None:
+        yield
+        return
+    report, start = _report, time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = report.spans.setdefault(name, {"calls": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["seconds"] += time.perf_counter() - start
+
+
+@contextmanager
+def recording(memory: bool = True) -> Iterator[Report]:
+    """Collect everything reported while the block runs, along with its wall time and, with `memory`, peak memory.
+
+    Tracing slows allocation heavy code down considerably, so time with `memory=False` and measure memory in a
+    separate recording when both matter.
+    """
+    global _report
+    outer, _report = _report, Report()
+    report, started_tracing = _report, memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif memory:
+        if outer is not None:  # Keep the enclosing recording's peak from being lost to the reset
+            outer.carried_peak = max(outer.carried_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    base_bytes = tracemalloc.get_traced_memory()[0] if memory else 0
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        if memory:
+            peak = max(tracemalloc.get_traced_memory()[1], report.carried_peak)
+            report.peak_bytes = peak - base_bytes
+            if outer is not None:
+                outer.carried_peak = max(outer.carried_peak, peak)
+        if started_tracing:
+            tracemalloc.stop()
+        _report = outer
+
+
+def export_json(reports: List[Dict[str, Any]], path: Path) -> None:
+    path.write_text(json.dumps(reports, indent=2))
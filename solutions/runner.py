@@ -0,0 +1,125 @@
+"""Command line runner for the daily solutions.
+
+Day modules are only imported inside the process that solves them, so asking for a single day never pays for
+importing the others, and selected parts are spread over a process pool so a full run takes about as long as the
+slowest part rather than the sum of all of them.
+"""
+import argparse
+import importlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from solutions import input_path, instrument
+from solutions.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+
+DAYS = tuple(range(1, 16))
+PARTS = (1, 2)
+
+
+class PartResult(NamedTuple):
+    day: int
+    part: int
+    answer: Any
+    seconds: float
+    report: Optional[Dict[str, Any]] = None  # `instrument.Report` of a profiled run
+    cached: bool = False
+
+
+def get_solver(day: int, part: int) -> Optional[Callable[[Path], Any]]:
+    module = importlib.import_module(f"solutions.day{day}")
+    return module.PARTS.get(part)
+
+
+def run_part(day: int, part: int, path: Optional[Path] = None, profile: bool = False) -> PartResult:
+    solver = get_solver(day, part)
+    if solver is None:
+        return PartResult(day, part, None, 0.0)
+    path = input_path(day) if path is None else path
+    if profile:  # Timed and counted untraced, memory measured in a separate run
+        with instrument.recording(memory=False) as report:
+            answer = solver(path)
+        with instrument.recording() as traced:
+            solver(path)
+        report.peak_bytes = traced.peak_bytes
+        return PartResult(day, part, answer, report.seconds, report.as_dict())
+    start = time.perf_counter()
+    answer = solver(path)
+    return PartResult(day, part, answer, time.perf_counter() - start)
+
+
+def run_parts(
+    selection: Sequence[Tuple[int, int]], workers: Optional[int] = None, profile: bool = False
+) -> List[PartResult]:
+    """Solve every (day, part) in `selection`, in parallel unless a single worker is requested."""
+    if workers == 1 or len(selection) < 2:
+        return [run_part(day, part, profile=profile) for day, part in selection]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_part, day, part, None, profile) for day, part in selection]
+        results = [future.result() for future in as_completed(futures)]
+    return sorted(results, key=lambda res: (res.day, res.part))
+
+
+def run_parts_cached(
+    selection: Sequence[Tuple[int, int]], cache: ResultCache, workers: Optional[int] = None
+) -> List[PartResult]:
+    """`run_parts`, answering from `cache` where possible and storing every newly solved answer in it."""
+    keys = {(day, part): cache.key(day, part, input_path(day)) for day, part in selection}
+    results, misses = [], []
+    for day, part in selection:
+        start = time.perf_counter()
+        hit, answer = cache.get(keys[day, part])
+        if hit:
+            results.append(PartResult(day, part, answer, time.perf_counter() - start, cached=True))
+        else:
+            misses.append((day, part))
+    for result in run_parts(misses, workers=workers):
+        if result.answer is not None:
+            cache.put(keys[result.day, result.part], result.answer)
+        results.append(result)
+    return sorted(results, key=lambda res: (res.day, res.part))
+
+
+def format_result(result: PartResult) -> str:
+    label = f"Day {result.day:>2} Part {result.part}:"
+    if result.answer is None:
+        return f"{label} unsolved"
+    answer, timing = str(result.answer), f"{result.seconds:.4f}s{', cached' * result.cached}"
+    if "\n" in answer:
+        return f"{label} ({timing})\n{answer}"
+    return f"{label} {answer}  ({timing})"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2022", description="Run Advent of Code 2022 solutions.")
+    parser.add_argument("days", nargs="*", type=int, metavar="DAY", help="days to run (default: all)")
+    parser.add_argument("-p", "--parts", nargs="+", type=int, choices=PARTS, default=PARTS, help="parts to run")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument(
+        "--profile", type=Path, metavar="PATH", help="write each part's time, peak memory and counters as JSON"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="solve every part, neither reading nor storing answers")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="where answers are cached")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES, help="cache size bound in bytes")
+    args = parser.parse_args(argv)
+    if any(day not in DAYS for day in args.days):
+        parser.error(f"days must be between {DAYS[0]} and {DAYS[-1]}")
+
+    selection = [(day, part) for day in (args.days or DAYS) for part in args.parts]
+    start = time.perf_counter()
+    if args.no_cache or args.profile is not None:  # Profiles need the parts actually solved
+        results = run_parts(selection, workers=args.workers, profile=args.profile is not None)
+    else:
+        results = run_parts_cached(selection, ResultCache(args.cache_dir, args.cache_size), workers=args.workers)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        print(format_result(result))
+    print(f"Total: {elapsed:.4f}s wall, {sum(res.seconds for res in results):.4f}s summed over parts")
+    if args.profile is not None:
+        reports = [{"day": res.day, "part": res.part, **res.report} for res in results if res.report is not None]
+        instrument.export_json(reports, args.profile)
+
+
+if __name__ == "__main__":
+    main()